@@ -187,6 +187,21 @@ class BamlAsyncClient:
                 "original_query": original_query,"context": context,
             })
             return typing.cast(types.ProcessedQuery, __result__.cast_to(types, types, stream_types, False, __runtime__))
+    async def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> typing.List["types.ProcessedQuery"]:
+        # Check if on_tick is provided
+        if 'on_tick' in baml_options:
+            # Use streaming internally when on_tick is provided
+            __stream__ = self.stream.ProcessQueryBatch(queries=queries,
+                baml_options=baml_options)
+            return await __stream__.get_final_response()
+        else:
+            # Original non-streaming code
+            __result__ = await self.__options.merge_options(baml_options).call_function_async(function_name="ProcessQueryBatch", args={
+                "queries": queries,
+            })
+            return typing.cast(typing.List["types.ProcessedQuery"], __result__.cast_to(types, types, stream_types, False, __runtime__))
     async def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> types.SimpleEvent:
@@ -202,6 +217,21 @@ class BamlAsyncClient:
                 
             })
             return typing.cast(types.SimpleEvent, __result__.cast_to(types, types, stream_types, False, __runtime__))
+    async def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> types.Timeline:
+        # Check if on_tick is provided
+        if 'on_tick' in baml_options:
+            # Use streaming internally when on_tick is provided
+            __stream__ = self.stream.UpdateTimeline(existing_timeline=existing_timeline,new_context=new_context,
+                baml_options=baml_options)
+            return await __stream__.get_final_response()
+        else:
+            # Original non-streaming code
+            __result__ = await self.__options.merge_options(baml_options).call_function_async(function_name="UpdateTimeline", args={
+                "existing_timeline": existing_timeline,"new_context": new_context,
+            })
+            return typing.cast(types.Timeline, __result__.cast_to(types, types, stream_types, False, __runtime__))
     
 
 
@@ -295,6 +325,18 @@ class BamlStreamClient:
           lambda x: typing.cast(types.ProcessedQuery, x.cast_to(types, types, stream_types, False, __runtime__)),
           __ctx__,
         )
+    def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlStream[typing.List["stream_types.ProcessedQuery"], typing.List["types.ProcessedQuery"]]:
+        __ctx__, __result__ = self.__options.merge_options(baml_options).create_async_stream(function_name="ProcessQueryBatch", args={
+            "queries": queries,
+        })
+        return baml_py.BamlStream[typing.List["stream_types.ProcessedQuery"], typing.List["types.ProcessedQuery"]](
+          __result__,
+          lambda x: typing.cast(typing.List["stream_types.ProcessedQuery"], x.cast_to(types, types, stream_types, True, __runtime__)),
+          lambda x: typing.cast(typing.List["types.ProcessedQuery"], x.cast_to(types, types, stream_types, False, __runtime__)),
+          __ctx__,
+        )
     def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> baml_py.BamlStream[stream_types.SimpleEvent, types.SimpleEvent]:
@@ -307,6 +349,18 @@ class BamlStreamClient:
           lambda x: typing.cast(types.SimpleEvent, x.cast_to(types, types, stream_types, False, __runtime__)),
           __ctx__,
         )
+    def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlStream[stream_types.Timeline, types.Timeline]:
+        __ctx__, __result__ = self.__options.merge_options(baml_options).create_async_stream(function_name="UpdateTimeline", args={
+            "existing_timeline": existing_timeline,"new_context": new_context,
+        })
+        return baml_py.BamlStream[stream_types.Timeline, types.Timeline](
+          __result__,
+          lambda x: typing.cast(stream_types.Timeline, x.cast_to(types, types, stream_types, True, __runtime__)),
+          lambda x: typing.cast(types.Timeline, x.cast_to(types, types, stream_types, False, __runtime__)),
+          __ctx__,
+        )
     
 
 class BamlHttpRequestClient:
@@ -364,6 +418,13 @@ class BamlHttpRequestClient:
             "original_query": original_query,"context": context,
         }, mode="request")
         return __result__
+    async def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="ProcessQueryBatch", args={
+            "queries": queries,
+        }, mode="request")
+        return __result__
     async def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> baml_py.baml_py.HTTPRequest:
@@ -371,6 +432,13 @@ class BamlHttpRequestClient:
             
         }, mode="request")
         return __result__
+    async def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="UpdateTimeline", args={
+            "existing_timeline": existing_timeline,"new_context": new_context,
+        }, mode="request")
+        return __result__
     
 
 class BamlHttpStreamRequestClient:
@@ -428,6 +496,13 @@ class BamlHttpStreamRequestClient:
             "original_query": original_query,"context": context,
         }, mode="stream")
         return __result__
+    async def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="ProcessQueryBatch", args={
+            "queries": queries,
+        }, mode="stream")
+        return __result__
     async def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> baml_py.baml_py.HTTPRequest:
@@ -435,6 +510,13 @@ class BamlHttpStreamRequestClient:
             
         }, mode="stream")
         return __result__
+    async def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = await self.__options.merge_options(baml_options).create_http_request_async(function_name="UpdateTimeline", args={
+            "existing_timeline": existing_timeline,"new_context": new_context,
+        }, mode="stream")
+        return __result__
     
 
 b = BamlAsyncClient(DoNotUseDirectlyCallManager({}))
\ No newline at end of file
@@ -66,12 +66,24 @@ class LlmResponseParser:
         __result__ = self.__options.merge_options(baml_options).parse_response(function_name="ProcessQuery", llm_response=llm_response, mode="request")
         return typing.cast(types.ProcessedQuery, __result__)
 
+    def ProcessQueryBatch(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> typing.List["types.ProcessedQuery"]:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="ProcessQueryBatch", llm_response=llm_response, mode="request")
+        return typing.cast(typing.List["types.ProcessedQuery"], __result__)
+
     def SimpleTest(
         self, llm_response: str, baml_options: BamlCallOptions = {},
     ) -> types.SimpleEvent:
         __result__ = self.__options.merge_options(baml_options).parse_response(function_name="SimpleTest", llm_response=llm_response, mode="request")
         return typing.cast(types.SimpleEvent, __result__)
 
+    def UpdateTimeline(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> types.Timeline:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="UpdateTimeline", llm_response=llm_response, mode="request")
+        return typing.cast(types.Timeline, __result__)
+
     
 
 class LlmStreamParser:
@@ -122,10 +134,22 @@ class LlmStreamParser:
         __result__ = self.__options.merge_options(baml_options).parse_response(function_name="ProcessQuery", llm_response=llm_response, mode="stream")
         return typing.cast(stream_types.ProcessedQuery, __result__)
 
+    def ProcessQueryBatch(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> typing.List["stream_types.ProcessedQuery"]:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="ProcessQueryBatch", llm_response=llm_response, mode="stream")
+        return typing.cast(typing.List["stream_types.ProcessedQuery"], __result__)
+
     def SimpleTest(
         self, llm_response: str, baml_options: BamlCallOptions = {},
     ) -> stream_types.SimpleEvent:
         __result__ = self.__options.merge_options(baml_options).parse_response(function_name="SimpleTest", llm_response=llm_response, mode="stream")
         return typing.cast(stream_types.SimpleEvent, __result__)
 
+    def UpdateTimeline(
+        self, llm_response: str, baml_options: BamlCallOptions = {},
+    ) -> stream_types.Timeline:
+        __result__ = self.__options.merge_options(baml_options).parse_response(function_name="UpdateTimeline", llm_response=llm_response, mode="stream")
+        return typing.cast(stream_types.Timeline, __result__)
+
     
\ No newline at end of file
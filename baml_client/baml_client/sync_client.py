@@ -192,6 +192,20 @@ class BamlSyncClient:
                 "original_query": original_query,"context": context,
             })
             return typing.cast(types.ProcessedQuery, __result__.cast_to(types, types, stream_types, False, __runtime__))
+    def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> typing.List["types.ProcessedQuery"]:
+        # Check if on_tick is provided
+        if 'on_tick' in baml_options:
+            __stream__ = self.stream.ProcessQueryBatch(queries=queries,
+                baml_options=baml_options)
+            return __stream__.get_final_response()
+        else:
+            # Original non-streaming code
+            __result__ = self.__options.merge_options(baml_options).call_function_sync(function_name="ProcessQueryBatch", args={
+                "queries": queries,
+            })
+            return typing.cast(typing.List["types.ProcessedQuery"], __result__.cast_to(types, types, stream_types, False, __runtime__))
     def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> types.SimpleEvent:
@@ -206,6 +220,20 @@ class BamlSyncClient:
                 
             })
             return typing.cast(types.SimpleEvent, __result__.cast_to(types, types, stream_types, False, __runtime__))
+    def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> types.Timeline:
+        # Check if on_tick is provided
+        if 'on_tick' in baml_options:
+            __stream__ = self.stream.UpdateTimeline(existing_timeline=existing_timeline,new_context=new_context,
+                baml_options=baml_options)
+            return __stream__.get_final_response()
+        else:
+            # Original non-streaming code
+            __result__ = self.__options.merge_options(baml_options).call_function_sync(function_name="UpdateTimeline", args={
+                "existing_timeline": existing_timeline,"new_context": new_context,
+            })
+            return typing.cast(types.Timeline, __result__.cast_to(types, types, stream_types, False, __runtime__))
     
 
 
@@ -299,6 +327,18 @@ class BamlStreamClient:
           lambda x: typing.cast(types.ProcessedQuery, x.cast_to(types, types, stream_types, False, __runtime__)),
           __ctx__,
         )
+    def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlSyncStream[typing.List["stream_types.ProcessedQuery"], typing.List["types.ProcessedQuery"]]:
+        __ctx__, __result__ = self.__options.merge_options(baml_options).create_sync_stream(function_name="ProcessQueryBatch", args={
+            "queries": queries,
+        })
+        return baml_py.BamlSyncStream[typing.List["stream_types.ProcessedQuery"], typing.List["types.ProcessedQuery"]](
+          __result__,
+          lambda x: typing.cast(typing.List["stream_types.ProcessedQuery"], x.cast_to(types, types, stream_types, True, __runtime__)),
+          lambda x: typing.cast(typing.List["types.ProcessedQuery"], x.cast_to(types, types, stream_types, False, __runtime__)),
+          __ctx__,
+        )
     def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> baml_py.BamlSyncStream[stream_types.SimpleEvent, types.SimpleEvent]:
@@ -311,6 +351,18 @@ class BamlStreamClient:
           lambda x: typing.cast(types.SimpleEvent, x.cast_to(types, types, stream_types, False, __runtime__)),
           __ctx__,
         )
+    def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlSyncStream[stream_types.Timeline, types.Timeline]:
+        __ctx__, __result__ = self.__options.merge_options(baml_options).create_sync_stream(function_name="UpdateTimeline", args={
+            "existing_timeline": existing_timeline,"new_context": new_context,
+        })
+        return baml_py.BamlSyncStream[stream_types.Timeline, types.Timeline](
+          __result__,
+          lambda x: typing.cast(stream_types.Timeline, x.cast_to(types, types, stream_types, True, __runtime__)),
+          lambda x: typing.cast(types.Timeline, x.cast_to(types, types, stream_types, False, __runtime__)),
+          __ctx__,
+        )
     
 
 class BamlHttpRequestClient:
@@ -368,6 +420,13 @@ class BamlHttpRequestClient:
             "original_query": original_query,"context": context,
         }, mode="request")
         return __result__
+    def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = self.__options.merge_options(baml_options).create_http_request_sync(function_name="ProcessQueryBatch", args={
+            "queries": queries,
+        }, mode="request")
+        return __result__
     def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> baml_py.baml_py.HTTPRequest:
@@ -375,6 +434,13 @@ class BamlHttpRequestClient:
             
         }, mode="request")
         return __result__
+    def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = self.__options.merge_options(baml_options).create_http_request_sync(function_name="UpdateTimeline", args={
+            "existing_timeline": existing_timeline,"new_context": new_context,
+        }, mode="request")
+        return __result__
     
 
 class BamlHttpStreamRequestClient:
@@ -432,6 +498,13 @@ class BamlHttpStreamRequestClient:
             "original_query": original_query,"context": context,
         }, mode="stream")
         return __result__
+    def ProcessQueryBatch(self, queries: typing.List[str],
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = self.__options.merge_options(baml_options).create_http_request_sync(function_name="ProcessQueryBatch", args={
+            "queries": queries,
+        }, mode="stream")
+        return __result__
     def SimpleTest(self, 
         baml_options: BamlCallOptions = {},
     ) -> baml_py.baml_py.HTTPRequest:
@@ -439,6 +512,13 @@ class BamlHttpStreamRequestClient:
             
         }, mode="stream")
         return __result__
+    def UpdateTimeline(self, existing_timeline: types.Timeline,new_context: str,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.baml_py.HTTPRequest:
+        __result__ = self.__options.merge_options(baml_options).create_http_request_sync(function_name="UpdateTimeline", args={
+            "existing_timeline": existing_timeline,"new_context": new_context,
+        }, mode="stream")
+        return __result__
     
 
 b = BamlSyncClient(DoNotUseDirectlyCallManager({}))
\ No newline at end of file
@@ -12,11 +12,13 @@ print("=" * 60, file=sys.stderr)
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import logging
 import base64
 import io
+import json
 
 try:
     from baml_client.baml_client import b
@@ -31,7 +33,7 @@ except ImportError:
 
 from .config import get_config
 from .timeline_builder import TimelineBuilder
-from .qdrant_setup import create_qdrant_client
+from .qdrant_setup import create_qdrant_client, create_async_qdrant_client, REMOTE_MODES
 
 # Configure logging to stdout for Render
 logging.basicConfig(
@@ -54,6 +56,7 @@ async def lifespan(app: FastAPI):
     
     # Set minimal state first to allow health checks to pass
     app.state.qdrant_client = None
+    app.state.async_qdrant_client = None
     app.state.timeline_builder = None
     app.state.multimodal_embedder = None
     app.state.multimodal_available = False
@@ -70,6 +73,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down API...")
+    if app.state.async_qdrant_client is not None:
+        await app.state.async_qdrant_client.close()
 
 
 def initialize_services(app: FastAPI):
@@ -87,7 +92,13 @@ def initialize_services(app: FastAPI):
         # Setup Qdrant
         try:
             app.state.qdrant_client = create_qdrant_client(config)
-            app.state.timeline_builder = TimelineBuilder(app.state.qdrant_client)
+            # Non-blocking retrieval needs a Qdrant server; embedded modes fall back to threads
+            if config.qdrant.mode in REMOTE_MODES:
+                app.state.async_qdrant_client = create_async_qdrant_client(config)
+            app.state.timeline_builder = TimelineBuilder(
+                app.state.qdrant_client,
+                async_qdrant_client=app.state.async_qdrant_client
+            )
             logger.info("Qdrant client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Qdrant: {e}")
@@ -326,6 +337,46 @@ async def generate_timeline(request: QueryRequest) -> Timeline:
         )
 
 
+@app.post("/api/timeline/stream")
+async def stream_timeline(request: QueryRequest) -> StreamingResponse:
+    """
+    Generate a timeline as Server-Sent Events.
+    
+    Each event is sent as a `data:` message as soon as the LLM completes it,
+    followed by a final `done` (or `error`) message. Image input is ignored.
+    """
+    initialize_services(app)
+    
+    if not app.state.baml_available:
+        raise HTTPException(
+            status_code=503,
+            detail="BAML client not available. Run: uv run baml-cli generate"
+        )
+    
+    filters = {}
+    if request.location:
+        filters["location"] = request.location
+    if request.min_credibility:
+        filters["min_credibility"] = request.min_credibility
+    if request.include_media_only:
+        filters["include_media_only"] = True
+    
+    async def event_stream():
+        try:
+            async for event in app.state.timeline_builder.stream_timeline(
+                query=request.topic,
+                limit=request.limit,
+                filters=filters if filters else None
+            ):
+                yield f"data: {event.model_dump_json()}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            logger.error(f"Timeline streaming error: {e}", exc_info=True)
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 async def _analyze_image_for_timeline(image, topic: str) -> Optional[str]:
     """
     Analyze image using Gemini to extract relevant context for timeline generation.
@@ -4,6 +4,7 @@ Manages environment variables, Qdrant configuration, and API settings.
 """
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -54,6 +55,8 @@ class EmbeddingConfig:
         self.model_name = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
         self.device = os.getenv("EMBEDDING_DEVICE", "cpu")
         self.batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+        self.cache_dir = os.getenv("EMBEDDING_CACHE_DIR", "./data/embedding_cache")
+        self.cache_max_rows = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "100000"))
 
 
 class SeleniumConfig:
@@ -88,8 +91,9 @@ class AppConfig:
         self.mock_data_path = pathlib.Path(os.getenv("MOCK_DATA_PATH", "./data/sample_x_data.csv"))
 
 
+@lru_cache(maxsize=1)
 def get_config() -> AppConfig:
-    """Get application configuration."""
+    """Get application configuration (read from the environment once)."""
     return AppConfig()
 
 
@@ -79,6 +79,33 @@ class EmbeddingModel:
         
         return [emb.tolist() for emb in embeddings]
     
+    def encode_array(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        normalize: bool = True
+    ) -> np.ndarray:
+        """
+        Encode multiple texts to a float32 matrix, skipping list conversion.
+        
+        Args:
+            texts: List of text strings
+            batch_size: Number of texts to process at once
+            normalize: Whether to normalize vectors (L2 normalization)
+        
+        Returns:
+            Array of shape (len(texts), vector_size)
+        """
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            normalize_embeddings=normalize,
+            convert_to_numpy=True
+        )
+        
+        return embeddings.astype(np.float32, copy=False)
+    
     def similarity(
         self,
         text1: str,
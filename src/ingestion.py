@@ -20,6 +20,16 @@ from .config import get_config
 
 logger = None
 
+# Mock CSV columns read as strings rather than type-inferred
+MOCK_TEXT_DTYPES = {
+    "tweet_id": str,
+    "text": str,
+    "author": str,
+    "timestamp": str,
+    "location": str,
+    "media_urls": str,
+}
+
 
 def get_logger():
     global logger
@@ -251,7 +261,9 @@ class XDataIngestor:
         get_logger().info(f"Loading mock data from: {filepath}")
         
         try:
-            df = pd.read_csv(filepath)
+            # Text columns are read as strings by the C parser; tweet IDs would
+            # otherwise become int64 (or float64, losing digits, if any is missing)
+            df = pd.read_csv(filepath, dtype=MOCK_TEXT_DTYPES)
             get_logger().info(f"Loaded {len(df)} mock posts")
             return df
         except FileNotFoundError:
@@ -446,7 +458,7 @@ def create_sample_mock_data(filepath: str = "./data/sample_x_data.csv") -> None:
             "fave_count": 3400,
             "retweet_count": 890,
             "is_verified": True,
-            "media_urls": "['https://example.com/flood-map.jpg']",
+            "media_urls": '["https://example.com/flood-map.jpg"]',
             "location": "Mumbai",
             "credibility_score": 0.92
         },
@@ -236,9 +236,9 @@ class ProcessedTweet(BaseModel):
     point_id: Optional[int] = Field(None, description="Qdrant point ID (hash of tweet_id)")
     
     def get_qdrant_point_id(self) -> int:
-        """Generate deterministic Qdrant point ID from tweet ID."""
-        import hashlib
-        return int(hashlib.md5(self.tweet.id.encode()).hexdigest()[:8], 16)
+        """Generate deterministic Qdrant point ID from tweet ID (63-bit xxh64)."""
+        import xxhash
+        return xxhash.xxh64_intdigest(self.tweet.id.encode()) & 0x7FFFFFFFFFFFFFFF
     
     def to_qdrant_point(self) -> Dict[str, Any]:
         """Convert to Qdrant point structure."""
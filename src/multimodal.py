@@ -12,6 +12,9 @@ import requests
 from io import BytesIO
 import logging
 import hashlib
+import sqlite3
+
+from .utils.embedding_cache import get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -125,17 +128,28 @@ class MultimodalEmbedder:
             if pil_image is None:
                 return None
             
-            # Check cache
+            # Check in-memory cache
             cache_key = self._get_image_hash(pil_image)
             if cache_key in self._image_cache:
                 return self._image_cache[cache_key]
             
-            # Encode with CLIP
-            embedding = self.clip_model.encode(
-                pil_image,
-                normalize_embeddings=normalize,
-                show_progress_bar=False
-            )
+            # Encode with CLIP, unless an earlier run already has
+            def encode() -> np.ndarray:
+                return self.clip_model.encode(
+                    pil_image,
+                    normalize_embeddings=normalize,
+                    show_progress_bar=False
+                )
+            
+            try:
+                embedding = get_embedding_cache().get_or_compute(
+                    bytes.fromhex(cache_key),
+                    encode,
+                    namespace=f"image:{self.CLIP_MODEL}:{'norm' if normalize else 'raw'}"
+                )
+            except (sqlite3.Error, OSError, ValueError) as e:
+                logger.debug(f"Embedding cache unavailable: {e}")
+                embedding = encode()
             
             result = embedding.tolist()
             
@@ -207,7 +221,8 @@ class MultimodalEmbedder:
         self,
         text: Optional[str] = None,
         image: Optional[Union[str, Image.Image]] = None,
-        fusion_method: str = "average"
+        fusion_method: str = "average",
+        image_embedding: Optional[List[float]] = None
     ) -> Optional[List[float]]:
         """
         Encode combined text and image content.
@@ -216,11 +231,12 @@ class MultimodalEmbedder:
             text: Optional text content
             image: Optional image (PIL, path, or URL)
             fusion_method: How to combine embeddings ('average', 'concat', 'text_weighted')
+            image_embedding: Precomputed encode_image result; used instead of image
         
         Returns:
             Combined embedding vector or None
         """
-        if not text and not image:
+        if not text and not image and image_embedding is None:
             return None
         
         text_emb = None
@@ -231,7 +247,9 @@ class MultimodalEmbedder:
             text_emb = np.array(self.encode_text(text, use_clip=True))
         
         # Get image embedding
-        if image and self.clip_model:
+        if image_embedding is not None:
+            image_emb = np.array(image_embedding)
+        elif image and self.clip_model:
             img_result = self.encode_image(image)
             if img_result:
                 image_emb = np.array(img_result)
@@ -357,9 +375,10 @@ class MultimodalEmbedder:
             return None
     
     def _get_image_hash(self, image: Image.Image) -> str:
-        """Generate hash for image caching."""
-        img_bytes = image.tobytes()
-        return hashlib.md5(img_bytes).hexdigest()
+        """Generate hash of image size and pixels for caching."""
+        digest = hashlib.sha256(f"{image.mode}:{image.size}".encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
     
     def _cache_embedding(self, key: str, embedding: List[float]) -> None:
         """Cache embedding with LRU eviction."""
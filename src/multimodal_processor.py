@@ -17,7 +17,7 @@ from .models.tweet import (
     ProcessedTweet,
     ImageAnalysisType,
 )
-from .utils.image_processor import ImageProcessor, process_tweet_images
+from .utils.image_processor import get_image_processor, process_tweet_images
 from .multimodal import get_multimodal_embedder, MultimodalEmbedder
 from .embeddings import get_embedding_model
 from .config import get_config
@@ -55,7 +55,7 @@ class MultimodalTweetProcessor:
         self.multimodal_embedder = get_multimodal_embedder(use_clip=use_clip) if use_clip else None
         
         # Initialize image processor
-        self.image_processor = ImageProcessor()
+        self.image_processor = get_image_processor()
         
         # Stats
         self.stats = {
@@ -209,7 +209,8 @@ class MultimodalTweetProcessor:
                     image.embedding = self.multimodal_embedder.encode_image(pil_image)
                 
                 # Set local path
-                image.local_path = str(self.image_processor._get_cache_path(image.url))
+                cached_path = self.image_processor.cached_path(image.url)
+                image.local_path = str(cached_path) if cached_path else None
                 
                 self.stats["images_processed"] += 1
                 
@@ -335,12 +336,15 @@ class MultimodalTweetProcessor:
             return []
         
         # Search using multimodal vector
-        results = self.client.search(
+        results = self.client.query_points(
             collection_name=self.config.collection_posts,
-            query_vector=("multimodal", image_embedding),
+            query=image_embedding,
+            using="multimodal",
             limit=limit,
-            score_threshold=min_score
-        )
+            score_threshold=min_score,
+            with_payload=True,
+            with_vectors=False
+        ).points
         
         return [
             {
@@ -356,7 +360,8 @@ class MultimodalTweetProcessor:
         query: str,
         query_image: Optional[str] = None,
         limit: int = 10,
-        filter_has_images: Optional[bool] = None
+        filter_has_images: Optional[bool] = None,
+        image_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search with combined text and optional image query.
@@ -366,6 +371,8 @@ class MultimodalTweetProcessor:
             query_image: Optional image path/URL for multimodal query
             limit: Number of results
             filter_has_images: If True, only return tweets with images
+            image_embedding: Precomputed CLIP embedding of the query image,
+                used instead of encoding query_image again
         
         Returns:
             List of matching tweets with scores
@@ -374,11 +381,12 @@ class MultimodalTweetProcessor:
             return []
         
         # Build query vector
-        if query_image and self.multimodal_embedder:
+        if (query_image or image_embedding is not None) and self.multimodal_embedder:
             query_vector = self.multimodal_embedder.encode_multimodal(
                 text=query,
                 image=query_image,
-                fusion_method="average"
+                fusion_method="average",
+                image_embedding=image_embedding
             )
             vector_name = "multimodal"
         elif self.multimodal_embedder:
@@ -401,12 +409,15 @@ class MultimodalTweetProcessor:
             )
         
         # Search
-        results = self.client.search(
+        results = self.client.query_points(
             collection_name=self.config.collection_posts,
-            query_vector=(vector_name, query_vector),
+            query=query_vector,
+            using=vector_name,
             query_filter=query_filter,
-            limit=limit
-        )
+            limit=limit,
+            with_payload=True,
+            with_vectors=False
+        ).points
         
         return [
             {
@@ -3,7 +3,7 @@ Chronofact.ai - Qdrant Setup Module
 Creates and manages Qdrant collections with multimodal vector support.
 """
 
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from qdrant_client.http.exceptions import UnexpectedResponse
 from typing import Optional, Dict
 import logging
@@ -17,6 +17,23 @@ logger = logging.getLogger(__name__)
 TEXT_VECTOR_SIZE = 384  # all-MiniLM-L6-v2
 CLIP_VECTOR_SIZE = 512  # clip-ViT-B-32
 
+# Modes that talk to a Qdrant server (as opposed to embedded storage)
+REMOTE_MODES = ("docker", "cloud", "hybrid")
+
+# Stored text vectors (used for rescoring) are half precision; embeddings are
+# unit-normalized, so float16 loses no meaningful cosine accuracy
+TEXT_VECTOR_DATATYPE = models.Datatype.FLOAT16
+
+# int8 codes for the low-dimensional text vectors, where 1-bit codes lose too
+# much recall; searches rescore the oversampled top hits with the originals
+TEXT_QUANTIZATION = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(
+        type=models.ScalarType.INT8,
+        quantile=0.99,
+        always_ram=True
+    )
+)
+
 
 def setup_collections(client: Optional[QdrantClient] = None) -> QdrantClient:
     """
@@ -100,7 +117,9 @@ def _create_multimodal_collection_if_not_exists(
             "text": models.VectorParams(
                 size=text_vector_size,
                 distance=models.Distance.COSINE,
-                hnsw_config=models.HnswConfigDiff(m=16, ef_construct=100)
+                hnsw_config=models.HnswConfigDiff(m=16, ef_construct=100),
+                quantization_config=TEXT_QUANTIZATION,
+                datatype=TEXT_VECTOR_DATATYPE
             ),
             "multimodal": models.VectorParams(
                 size=CLIP_VECTOR_SIZE,
@@ -120,12 +139,17 @@ def _create_multimodal_collection_if_not_exists(
             optimizers_config=models.OptimizersConfigDiff(
                 indexing_threshold=20000
             ),
+            # 1-bit codes kept in RAM for the ANN scan of the CLIP vectors (the
+            # text vector overrides this with int8); originals rescore the top hits
+            quantization_config=models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            ),
             replication_factor=1,
             write_consistency_factor=1
         )
         
         # Create payload indexes for efficient filtering
-        _create_payload_indexes(client, collection_name)
+        create_payload_indexes(client, collection_name)
         
         logger.info(f"✓ Created multimodal collection: {collection_name}")
         
@@ -134,19 +158,27 @@ def _create_multimodal_collection_if_not_exists(
         raise
 
 
-def _create_payload_indexes(client: QdrantClient, collection_name: str) -> None:
-    """Create payload field indexes for efficient filtering."""
+# Payload fields filtered on by HybridSearcher and the multimodal search
+POST_PAYLOAD_INDEXES = (
+    ("has_images", models.PayloadSchemaType.BOOL),
+    ("author_verified", models.PayloadSchemaType.BOOL),
+    ("is_verified", models.PayloadSchemaType.BOOL),
+    ("author", models.PayloadSchemaType.KEYWORD),
+    ("credibility_score", models.PayloadSchemaType.FLOAT),
+    ("location", models.PayloadSchemaType.KEYWORD),
+    ("timestamp", models.PayloadSchemaType.DATETIME),
+)
+
+
+def create_payload_indexes(client: QdrantClient, collection_name: str) -> None:
+    """
+    Create payload field indexes for efficient filtering.
+    
+    Safe to call on a collection that already has them, e.g. before an
+    ingest into a collection created by an older version.
+    """
     try:
-        # Index commonly filtered fields
-        indexed_fields = [
-            ("has_images", models.PayloadSchemaType.BOOL),
-            ("author_verified", models.PayloadSchemaType.BOOL),
-            ("credibility_score", models.PayloadSchemaType.FLOAT),
-            ("location", models.PayloadSchemaType.KEYWORD),
-            ("timestamp", models.PayloadSchemaType.DATETIME),
-        ]
-        
-        for field_name, field_type in indexed_fields:
+        for field_name, field_type in POST_PAYLOAD_INDEXES:
             try:
                 client.create_payload_index(
                     collection_name=collection_name,
@@ -191,11 +223,13 @@ def _create_collection_if_not_exists(
                 hnsw_config=models.HnswConfigDiff(
                     m=16,
                     ef_construct=100
-                )
+                ),
+                datatype=TEXT_VECTOR_DATATYPE
             ),
             optimizers_config=models.OptimizersConfigDiff(
                 indexing_threshold=20000
             ),
+            quantization_config=TEXT_QUANTIZATION,
             replication_factor=1,
             write_consistency_factor=1
         )
@@ -247,7 +281,8 @@ def create_qdrant_client(config: Optional[AppConfig] = None) -> QdrantClient:
             client_kwargs = {
                 "url": url,
                 "timeout": qdrant_config.timeout,
-                "prefer_grpc": True
+                "prefer_grpc": True,
+                "grpc_port": qdrant_config.grpc_port
             }
             # Only add API key if explicitly provided (for secured Docker setups)
             if qdrant_config.api_key:
@@ -268,7 +303,8 @@ def create_qdrant_client(config: Optional[AppConfig] = None) -> QdrantClient:
                     url=url,
                     api_key=qdrant_config.api_key,
                     timeout=qdrant_config.timeout,
-                    prefer_grpc=True  # Use gRPC for better performance with Qdrant Cloud
+                    prefer_grpc=True,  # Use gRPC for better performance with Qdrant Cloud
+                    grpc_port=qdrant_config.grpc_port
                 )
                 logger.info(f"✅ Connected to Qdrant Cloud (Core Component) at: {url}")
                 logger.info("Qdrant is the primary vector search engine for Chronofact.ai")
@@ -306,6 +342,56 @@ def create_qdrant_client(config: Optional[AppConfig] = None) -> QdrantClient:
         raise
 
 
+def create_async_qdrant_client(config: Optional[AppConfig] = None) -> AsyncQdrantClient:
+    """
+    Create an async Qdrant client for remote deployment modes.
+
+    Embedded modes are not supported: local storage is locked by the sync
+    client, and a separate in-memory store would not share its data.
+
+    Args:
+        config: Optional AppConfig. Uses default if not provided.
+
+    Returns:
+        Configured AsyncQdrantClient instance
+
+    Raises:
+        ValueError: If the configured mode has no Qdrant server
+    """
+    if config is None:
+        config = get_config()
+
+    qdrant_config = config.qdrant
+    mode = qdrant_config.mode
+
+    if mode not in REMOTE_MODES:
+        raise ValueError(f"Async Qdrant client requires a remote mode, got: {mode}")
+
+    if mode == "cloud":
+        if not qdrant_config.url:
+            raise ValueError("QDRANT_URL is required for cloud mode")
+        url = qdrant_config.url
+        if not url.startswith(("http://", "https://")):
+            url = f"https://{url}"
+    else:
+        protocol = "https" if qdrant_config.https else "http"
+        url = f"{protocol}://{qdrant_config.host}:{qdrant_config.port}"
+
+    # Mirror the transport choices of create_qdrant_client
+    client_kwargs = {
+        "url": url,
+        "timeout": qdrant_config.timeout,
+        "prefer_grpc": mode != "hybrid",
+        "grpc_port": qdrant_config.grpc_port
+    }
+    if qdrant_config.api_key:
+        client_kwargs["api_key"] = qdrant_config.api_key
+
+    client = AsyncQdrantClient(**client_kwargs)
+    logger.info(f"Using async Qdrant client at: {url}")
+    return client
+
+
 def delete_collection(client: QdrantClient, collection_name: str) -> None:
     """
     Delete a Qdrant collection.
@@ -3,8 +3,9 @@ Chronofact.ai - Search Module
 Implements hybrid search combining dense, sparse, and metadata filtering.
 """
 
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from typing import List, Dict, Optional, Any
+import asyncio
 import logging
 
 from .config import get_config
@@ -12,18 +13,35 @@ from .embeddings import get_embedding_model
 
 logger = logging.getLogger(__name__)
 
+# Scan quantized vectors (int8 for text, binary for images), then rescore an
+# oversampled shortlist with the originals.
+# Collections without quantization ignore these params.
+QUANTIZED_SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(
+        ignore=False,
+        rescore=True,
+        oversampling=2.0
+    )
+)
+
 
 class HybridSearcher:
     """Hybrid search combining semantic and keyword search."""
     
-    def __init__(self, qdrant_client: Optional[QdrantClient] = None):
+    def __init__(
+        self,
+        qdrant_client: Optional[QdrantClient] = None,
+        async_client: Optional[AsyncQdrantClient] = None
+    ):
         """Initialize hybrid searcher.
         
         Args:
             qdrant_client: Optional QdrantClient instance
+            async_client: Optional AsyncQdrantClient for the async search methods
         """
         self.config = get_config()
         self.client = qdrant_client
+        self.async_client = async_client
         self.embedding_model = get_embedding_model()
     
     def search(
@@ -64,14 +82,16 @@ class HybridSearcher:
         
         # Perform search
         try:
-            results = self.client.search(
+            # Payload only: vectors would dominate the response size
+            results = self.client.query_points(
                 collection_name=collection_name,
-                query_vector=query_vector,
+                query=query_vector,
                 query_filter=qdrant_filter,
+                search_params=QUANTIZED_SEARCH_PARAMS,
                 limit=limit * 2,  # Fetch more for re-ranking
                 with_payload=True,
                 with_vectors=False
-            )
+            ).points
             
             # Apply post-processing
             filtered_results = self._post_process(
@@ -87,6 +107,121 @@ class HybridSearcher:
             logger.error(f"Search error: {e}")
             return []
     
+    def search_batch(
+        self,
+        queries: List[str],
+        collection_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None
+    ) -> List[List[models.ScoredPoint]]:
+        """
+        Perform several searches in a single Qdrant request.
+
+        Args:
+            queries: Search query texts
+            collection_name: Name of collection to search
+            limit: Maximum number of results per query
+            filters: Metadata filters dictionary, shared by all queries
+            score_threshold: Minimum similarity score
+
+        Returns:
+            One list of scored points per query, in query order
+
+        Raises:
+            Exception: Whatever the Qdrant request raised, so callers can
+                tell a failed search from one that matched nothing
+        """
+        if not queries:
+            return []
+        if collection_name is None:
+            collection_name = self.config.collection_posts
+        if limit is None:
+            limit = self.config.default_search_limit
+
+        logger.info(f"Batch searching {len(queries)} queries (limit: {limit})")
+
+        responses = self.client.query_batch_points(
+            collection_name=collection_name,
+            requests=self._build_batch_requests(queries, limit, filters)
+        )
+
+        return [
+            self._post_process(response.points, score_threshold, limit)
+            for response in responses
+        ]
+
+    async def asearch_batch(
+        self,
+        queries: List[str],
+        collection_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None
+    ) -> List[List[models.ScoredPoint]]:
+        """
+        Async variant of search_batch.
+
+        Uses the AsyncQdrantClient when one was provided; otherwise runs the
+        sync search in a worker thread so the event loop is never blocked.
+
+        Returns:
+            One list of scored points per query, in query order
+
+        Raises:
+            Exception: Whatever the Qdrant request raised, as for search_batch
+        """
+        if self.async_client is None:
+            return await asyncio.to_thread(
+                self.search_batch, queries, collection_name, limit, filters, score_threshold
+            )
+
+        if not queries:
+            return []
+        if collection_name is None:
+            collection_name = self.config.collection_posts
+        if limit is None:
+            limit = self.config.default_search_limit
+
+        logger.info(f"Batch searching {len(queries)} queries (limit: {limit})")
+
+        # Encoding is CPU-bound; keep it off the event loop
+        requests = await asyncio.to_thread(self._build_batch_requests, queries, limit, filters)
+
+        responses = await self.async_client.query_batch_points(
+            collection_name=collection_name,
+            requests=requests
+        )
+
+        return [
+            self._post_process(response.points, score_threshold, limit)
+            for response in responses
+        ]
+
+    def _build_batch_requests(
+        self,
+        queries: List[str],
+        limit: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[models.QueryRequest]:
+        """Encode queries in one forward pass and build their query requests."""
+        query_vectors = self.embedding_model.encode_array(list(queries))
+
+        # Build Qdrant filter once for every request
+        qdrant_filter = self._build_filter(filters or {})
+
+        return [
+            models.QueryRequest(
+                query=vec,
+                filter=qdrant_filter,
+                params=QUANTIZED_SEARCH_PARAMS,
+                limit=limit * 2,  # Fetch more for re-ranking
+                with_payload=True,
+                with_vector=False
+            )
+            for vec in query_vectors
+        ]
+
     def search_with_rerank(
         self,
         query: str,
@@ -142,21 +277,22 @@ class HybridSearcher:
             List of scored points
         """
         try:
-            results = self.client.search_batch(
+            responses = self.client.query_batch_points(
                 collection_name=collection_name,
                 requests=[
-                    models.SearchRequest(
-                        vector=vec,
+                    models.QueryRequest(
+                        query=vec,
+                        params=QUANTIZED_SEARCH_PARAMS,
                         limit=limit,
                         with_payload=True,
-                        with_vectors=False
+                        with_vector=False
                     )
                     for vec in query_vectors
                 ]
             )
             
             # Combine and deduplicate results
-            combined = self._combine_results(results)
+            combined = self._combine_results([response.points for response in responses])
             return combined[:limit]
             
         except Exception as e:
@@ -342,12 +478,13 @@ class HybridSearcher:
             post_vector = post[0].vector
             
             # Search for similar posts
-            results = self.client.search(
+            results = self.client.query_points(
                 collection_name=collection_name,
-                query_vector=post_vector,
+                query=post_vector,
                 limit=limit + 1,  # +1 to exclude self
-                with_payload=True
-            )
+                with_payload=True,
+                with_vectors=False
+            ).points
             
             # Filter out the original post
             similar = [r for r in results if r.id != post_id]
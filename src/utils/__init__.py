@@ -3,11 +3,18 @@ Chronofact.ai - Utilities
 Helper functions and processors.
 """
 
-from .image_processor import ImageProcessor, download_image, analyze_image
+from .image_processor import ImageProcessor, download_image, analyze_image, get_image_processor
+from .batching import AsyncBatcher
+from .embedding_cache import EmbeddingCache, content_key, get_embedding_cache
 
 __all__ = [
     "ImageProcessor",
     "download_image",
     "analyze_image",
+    "get_image_processor",
+    "AsyncBatcher",
+    "EmbeddingCache",
+    "content_key",
+    "get_embedding_cache",
 ]
 
@@ -0,0 +1,100 @@
+"""
+Chronofact.ai - Request Batching Utilities
+Coalesces concurrent async calls into batched calls.
+"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBatcher:
+    """
+    Collects items submitted concurrently and processes them in batches.
+    
+    A batch is flushed when it reaches max_batch_size, or max_queue_time
+    seconds after its first item arrived. Subclasses implement process_batch.
+    """
+    
+    def __init__(self, max_batch_size: int = 16, max_queue_time: float = 0.02):
+        """Initialize batcher.
+        
+        Args:
+            max_batch_size: Maximum items per batch
+            max_queue_time: Maximum seconds an item waits for a batch to fill
+        """
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set = set()
+    
+    async def submit(self, item: Any) -> Any:
+        """
+        Submit an item and wait for its result.
+        
+        Raises:
+            Exception: Whatever process_batch raised for the item's batch,
+                or returned in place of the item's result
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Pending state belongs to a previous (finished) event loop
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+        
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_queue_time, self._flush)
+        
+        return await future
+    
+    async def process_batch(self, items: List[Any]) -> List[Any]:
+        """
+        Process a batch of items, returning one result per item in order.
+        
+        An exception returned in place of a result fails only that item's
+        submitter; raising fails the whole batch.
+        """
+        raise NotImplementedError
+    
+    def _flush(self) -> None:
+        """Start processing everything pending as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = self._loop.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run process_batch and resolve each submitter's future."""
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.debug(f"Batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
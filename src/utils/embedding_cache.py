@@ -0,0 +1,347 @@
+"""
+Chronofact.ai - Embedding Cache
+Persistent, content-addressed cache for text and image embeddings.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Default cache location and size (rows per namespace)
+DEFAULT_CACHE_DIR = "./data/embedding_cache"
+DEFAULT_MAX_ROWS = 100_000
+
+# Rows added to a namespace's vector file each time it fills up
+GROWTH_ROWS = 1024
+
+# Cache hits refresh an entry's last_used at most this often, so most
+# lookups write nothing to the index
+TOUCH_INTERVAL = 60.0  # seconds
+
+
+def content_key(data: Union[str, bytes]) -> bytes:
+    """Return the SHA-256 digest used as a cache key for text or raw bytes."""
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).digest()
+
+
+class EmbeddingCache:
+    """
+    On-disk LRU cache of embedding vectors keyed by content hash.
+    
+    Each namespace (typically one per model) keeps its vectors as float16
+    rows of a memory-mapped file; a sqlite index maps keys to rows and
+    tracks last use, so the least recently used rows are recycled once a
+    namespace reaches max_rows.
+    
+    Several processes (e.g. the API server and a CLI ingest) may share a
+    cache directory: every lookup and store holds sqlite's write lock from
+    reading the index until its vector rows are read or written.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_rows: int = DEFAULT_MAX_ROWS
+    ):
+        """
+        Initialize embedding cache.
+        
+        Args:
+            cache_dir: Directory holding the index and vector files
+            max_rows: Maximum vectors kept per namespace
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_rows = max_rows
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "index.sqlite"), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS namespaces (
+                name TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                rows INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key BLOB NOT NULL,
+                row INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, last_used);
+        """)
+        self._arrays: Dict[str, np.memmap] = {}
+    
+    def get_many(self, namespace: str, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """
+        Look up several keys at once.
+        
+        Returns:
+            One float32 vector per key, or None where the key is not cached
+        """
+        if not keys:
+            return []
+        
+        with self._transaction():
+            entries = self._lookup_entries(namespace, keys)
+            if not entries:
+                return [None] * len(keys)
+            
+            now = time.time()
+            stale = [key for key, (_, last_used) in entries.items() if now - last_used >= TOUCH_INTERVAL]
+            if stale:
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE namespace = ? AND key = ?",
+                    [(now, namespace, key) for key in stale]
+                )
+            
+            rows = {key: row for key, (row, _) in entries.items()}
+            array = self._array(namespace, max(rows.values()) + 1)
+            return [
+                array[rows[key]].astype(np.float32) if key in rows else None
+                for key in keys
+            ]
+    
+    def put_many(self, namespace: str, keys: Sequence[bytes], vectors: np.ndarray) -> None:
+        """
+        Store one vector per key, evicting least recently used rows if full.
+        
+        Rows holding keys from this batch are never evicted; new keys that
+        do not fit in max_rows are left uncached.
+        """
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if not len(keys):
+            return
+        
+        # Last write wins for keys repeated within the batch
+        unique = dict(zip(keys, vectors))
+        
+        with self._transaction():
+            dim, used = self._namespace(namespace, vectors.shape[1])
+            existing = {key: row for key, (row, _) in self._lookup_entries(namespace, list(unique)).items()}
+            new_keys = [key for key in unique if key not in existing]
+            
+            rows = dict(existing)
+            rows.update(self._allocate_rows(namespace, dim, used, new_keys, set(existing)))
+            if len(rows) < len(unique):
+                logger.debug(
+                    f"Embedding cache [{namespace}]: {len(unique) - len(rows)} vectors exceed max_rows, not cached"
+                )
+            if not rows:
+                return
+            
+            array = self._array(namespace, max(rows.values()) + 1)
+            for key, row in rows.items():
+                array[row] = unique[key]
+            array.flush()
+            
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (namespace, key, row, last_used) VALUES (?, ?, ?, ?)",
+                [(namespace, key, row, now) for key, row in rows.items()]
+            )
+    
+    def get_or_compute(
+        self,
+        key: bytes,
+        compute_fn: Callable[[], np.ndarray],
+        namespace: str = "default"
+    ) -> np.ndarray:
+        """Return the cached vector for key, computing and storing it on a miss."""
+        return self.get_or_compute_many(
+            [key],
+            lambda missing: np.asarray(compute_fn())[None, :],
+            namespace
+        )[0]
+    
+    def get_or_compute_many(
+        self,
+        keys: Sequence[bytes],
+        compute_fn: Callable[[List[int]], np.ndarray],
+        namespace: str = "default"
+    ) -> np.ndarray:
+        """
+        Return vectors for all keys, computing only the misses in one call.
+        
+        Args:
+            keys: Content keys (see content_key)
+            compute_fn: Called with the indices of missing keys; returns their
+                vectors as a 2-D array in the same order
+            namespace: Cache namespace, e.g. one per embedding model
+        
+        Returns:
+            float32 array of shape (len(keys), dim)
+        """
+        vectors = self.get_many(namespace, keys)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        
+        if missing:
+            computed = np.asarray(compute_fn(missing), dtype=np.float32)
+            self.put_many(namespace, [keys[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+            logger.debug(f"Embedding cache [{namespace}]: {len(keys) - len(missing)} hits, {len(missing)} misses")
+        
+        return np.stack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+    
+    def close(self) -> None:
+        """Flush vector files and close the index."""
+        with self._lock:
+            for array in self._arrays.values():
+                array.flush()
+            self._arrays.clear()
+            self._db.close()
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """
+        Hold the in-process lock and sqlite's write lock, committing on exit.
+        
+        BEGIN IMMEDIATE makes other processes wait before they read the
+        index, so two of them never hand out the same rows or read a row
+        while it is rewritten.
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._db.rollback()
+                raise
+            self._db.commit()
+    
+    def _lookup_entries(self, namespace: str, keys: Sequence[bytes]) -> Dict[bytes, Tuple[int, float]]:
+        """Map the cached subset of keys to their (row, last_used)."""
+        entries = {}
+        # Stay under sqlite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = list(keys[start:start + 500])
+            placeholders = ",".join("?" * len(chunk))
+            entries.update(
+                (key, (row, last_used))
+                for key, row, last_used in self._db.execute(
+                    f"SELECT key, row, last_used FROM entries WHERE namespace = ? AND key IN ({placeholders})",
+                    [namespace, *chunk]
+                )
+            )
+        return entries
+    
+    def _namespace(self, namespace: str, dim: int) -> tuple:
+        """Return (dim, rows used) for a namespace, registering it if new."""
+        found = self._db.execute(
+            "SELECT dim, rows FROM namespaces WHERE name = ?", (namespace,)
+        ).fetchone()
+        if found is None:
+            self._db.execute(
+                "INSERT INTO namespaces (name, dim, rows) VALUES (?, ?, 0)", (namespace, dim)
+            )
+            return dim, 0
+        if found[0] != dim:
+            raise ValueError(f"Namespace '{namespace}' stores {found[0]}-dim vectors, got {dim}")
+        return found
+    
+    def _allocate_rows(
+        self,
+        namespace: str,
+        dim: int,
+        used: int,
+        keys: List[bytes],
+        protected: set
+    ) -> Dict[bytes, int]:
+        """
+        Assign rows to new keys: free rows first, then least recently used.
+        
+        Rows of protected keys (those already stored in the current batch)
+        are never evicted, so fewer rows than keys may be returned.
+        """
+        count = len(keys)
+        fresh = min(count, max(self.max_rows - used, 0))
+        rows = list(range(used, used + fresh))
+        
+        if count > fresh:
+            # At most len(protected) of the oldest rows are skipped below
+            candidates = self._db.execute(
+                "SELECT key, row FROM entries WHERE namespace = ? ORDER BY last_used LIMIT ?",
+                (namespace, count - fresh + len(protected))
+            ).fetchall()
+            evicted = [(key, row) for key, row in candidates if key not in protected][:count - fresh]
+            self._db.executemany(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                [(namespace, key) for key, _ in evicted]
+            )
+            rows.extend(row for _, row in evicted)
+        
+        if fresh:
+            self._db.execute(
+                "UPDATE namespaces SET rows = ? WHERE name = ?", (used + fresh, namespace)
+            )
+            self._ensure_capacity(namespace, dim, used + fresh)
+        
+        return dict(zip(keys, rows))
+    
+    def _vector_path(self, namespace: str) -> Path:
+        """Vector file for a namespace."""
+        safe_name = re.sub(r"[^\w.-]", "_", namespace)
+        return self.cache_dir / f"{safe_name}.f16"
+    
+    def _array(self, namespace: str, rows: int) -> np.memmap:
+        """Return the (cached) memmap over a namespace's vector file, covering at least rows."""
+        array = self._arrays.get(namespace)
+        # Another process may have grown the file since it was mapped
+        if array is None or array.shape[0] < rows:
+            dim, _ = self._db.execute(
+                "SELECT dim, rows FROM namespaces WHERE name = ?", (namespace,)
+            ).fetchone()
+            path = self._vector_path(namespace)
+            capacity = path.stat().st_size // (dim * 2) if path.exists() else 0
+            array = np.memmap(path, dtype=np.float16, mode="r+", shape=(capacity, dim))
+            self._arrays[namespace] = array
+        return array
+    
+    def _ensure_capacity(self, namespace: str, dim: int, rows: int) -> None:
+        """Grow a namespace's vector file to hold at least rows vectors."""
+        path = self._vector_path(namespace)
+        size = path.stat().st_size if path.exists() else 0
+        if size >= rows * dim * 2:
+            return
+        
+        capacity = min(max(rows, size // (dim * 2) + GROWTH_ROWS), self.max_rows)
+        array = self._arrays.pop(namespace, None)
+        if array is not None:
+            array.flush()
+            del array
+        with open(path, "ab") as f:
+            f.truncate(capacity * dim * 2)
+
+
+# Global instance (lazy loaded)
+_cache_instance: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the global embedding cache."""
+    global _cache_instance
+    
+    if _cache_instance is None:
+        from ..config import get_config
+        config = get_config()
+        
+        _cache_instance = EmbeddingCache(
+            cache_dir=config.embedding.cache_dir,
+            max_rows=config.embedding.cache_max_rows
+        )
+    
+    return _cache_instance
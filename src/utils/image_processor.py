@@ -4,29 +4,134 @@ Handles image downloading, analysis, and preprocessing for multimodal embeddings
 """
 
 import os
-import hashlib
+import asyncio
+import contextlib
 import logging
+import mimetypes
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Self, Tuple
 from io import BytesIO
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import httpx
+import orjson
 import requests
-from PIL import Image, ImageStat, ImageFilter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PIL import Image, ImageStat
 import numpy as np
+import xxhash
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Default cache directory
 DEFAULT_CACHE_DIR = "./data/image_cache"
 
+# Index of cached files, kept inside the cache directory
+INDEX_FILENAME = "index.sqlite"
+
 # Supported image formats
 SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
 
+# Sent with every image download
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Async downloads: requests in flight and idle connections kept per batch
+ASYNC_MAX_CONNECTIONS = 32
+ASYNC_MAX_KEEPALIVE = 16
+
 # Max image size for processing (to avoid memory issues)
 MAX_IMAGE_SIZE = (1920, 1920)
 THUMBNAIL_SIZE = (224, 224)  # CLIP input size
 
+# Downscales by at least this factor box-reduce by an integer factor first,
+# leaving LANCZOS only the final < REDUCING_GAP step
+REDUCING_GAP = 2.0
+
+# Screenshot aspect ratios (width/height) in hundredths: 16:9 and phone ratios
+SCREENSHOT_ASPECTS = (178, 217, 216)
+
+# Bump when prepare_for_clip changes, so stale CLIP-ready arrays are not reused
+CLIP_CACHE_VERSION = 1
+
+# Bump when _analyze changes, so stale cached analyses are not reused
+ANALYSIS_VERSION = 1
+
+# Dominant-color clustering: pixels sampled and k-means iterations
+COLOR_SAMPLE_SIZE = (100, 100)
+KMEANS_MAX_ITER = 20
+
+# Image types whose palettes are worth clustering; photos get a single Lab mean
+PALETTE_IMAGE_TYPES = {"meme", "screenshot", "infographic"}
+
+# D65 reference white and sRGB <-> CIE XYZ matrices
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+
+
+def _kmeans(pixels: np.ndarray, k: int, max_iter: int = KMEANS_MAX_ITER) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster an (n, 3) float array of pixels with Lloyd's k-means.
+    
+    Initial centers are spread evenly over the pixels sorted by brightness,
+    so results are deterministic.
+    
+    Returns:
+        (centers, labels) with one label per pixel
+    """
+    k = min(k, len(pixels))
+    by_brightness = np.argsort(pixels.sum(axis=1), kind="stable")
+    centers = pixels[by_brightness[np.linspace(0, len(pixels) - 1, k).astype(int)]]
+    
+    for _ in range(max_iter):
+        distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack(
+            [np.bincount(labels, weights=pixels[:, c], minlength=k) for c in range(pixels.shape[1])],
+            axis=1
+        )
+        # Empty clusters keep their previous center
+        updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        if np.allclose(updated, centers):
+            break
+        centers = updated
+    
+    return centers, labels
+
+
+def _srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert an (n, 3) array of 0-255 sRGB values to CIE Lab (D65)."""
+    c = rgb / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _RGB_TO_XYZ.T / _D65_WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def _lab_to_srgb(lab: np.ndarray) -> np.ndarray:
+    """Convert an (n, 3) array of CIE Lab (D65) values to 0-255 sRGB, clipped to gamut."""
+    fy = (lab[:, 0] + 16) / 116
+    f = np.stack([fy + lab[:, 1] / 500, fy, fy - lab[:, 2] / 200], axis=1)
+    xyz = np.where(f > 6 / 29, f ** 3, 3 * (6 / 29) ** 2 * (f - 4 / 29)) * _D65_WHITE
+    linear = np.clip(xyz @ _XYZ_TO_RGB.T, 0, 1)
+    c = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return c * 255
+
 
 class ImageProcessor:
     """
@@ -53,17 +158,47 @@ class ImageProcessor:
         self.max_workers = max_workers
         self.timeout = timeout
         
-        # Stats
+        # One pooled session, so images from the same host reuse connections
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers * 2,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # URL -> cached file index, so cache hits need no per-file stat()
+        self._index_lock = threading.Lock()
+        self._index = sqlite3.connect(str(self.cache_dir / INDEX_FILENAME), check_same_thread=False)
+        self._index.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS images (
+                url_hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS analyses (
+                content_hash TEXT PRIMARY KEY,
+                analysis BLOB NOT NULL
+            );
+        """)
+        
+        # Stats, updated by download threads under their own lock
+        self._stats_lock = threading.Lock()
         self.stats = {
             "downloaded": 0,
             "cached": 0,
-            "failed": 0,
+            "failed": 0
         }
     
     def download_image(
         self,
         url: str,
-        save_local: bool = True
+        save_local: bool = True,
+        target_size: Optional[Tuple[int, int]] = None
     ) -> Optional[Image.Image]:
         """
         Download image from URL.
@@ -71,58 +206,122 @@ class ImageProcessor:
         Args:
             url: Image URL
             save_local: Whether to cache locally
+            target_size: Exact output size (e.g. THUMBNAIL_SIZE for CLIP);
+                defaults to fitting within MAX_IMAGE_SIZE
         
         Returns:
             PIL Image or None if failed
         """
         try:
             # Check cache first
-            cache_path = self._get_cache_path(url)
-            if cache_path.exists():
-                self.stats["cached"] += 1
-                return Image.open(cache_path).convert("RGB")
-            
-            # Download
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=self.timeout, stream=True)
-            response.raise_for_status()
-            
-            # Verify content type
-            content_type = response.headers.get("Content-Type", "")
-            if not content_type.startswith("image/"):
-                logger.warning(f"Non-image content type: {content_type}")
-                return None
-            
-            # Load image
-            image_data = BytesIO(response.content)
-            image = Image.open(image_data).convert("RGB")
-            
-            # Resize if too large
-            if image.size[0] > MAX_IMAGE_SIZE[0] or image.size[1] > MAX_IMAGE_SIZE[1]:
-                image.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+            cached = self._lookup_paths([url]).get(url)
+            if cached is not None:
+                try:
+                    image = self._decode(cached, target_size)
+                    self._count("cached")
+                    return image
+                except FileNotFoundError:
+                    # Deleted behind the index's back; download it again
+                    self._forget(url)
             
-            # Cache locally
             if save_local:
-                self._save_to_cache(image, cache_path)
+                # Cache the original bytes, then decode from the file
+                path = self._download_to_cache(url)
+                if path is None:
+                    return None
+                image = self._decode_download(url, path, target_size)
+            else:
+                with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    
+                    # Verify content type
+                    content_type = response.headers.get("Content-Type", "")
+                    if not content_type.startswith("image/"):
+                        logger.warning(f"Non-image content type: {content_type}")
+                        return None
+                    
+                    # Load image straight from the connection, without response.content's copy
+                    response.raw.decode_content = True
+                    image = self._decode(response.raw, target_size)
+                    image.load()
             
-            self.stats["downloaded"] += 1
+            self._count("downloaded")
             return image
             
         except requests.RequestException as e:
             logger.warning(f"Failed to download image {url}: {e}")
-            self.stats["failed"] += 1
+            self._count("failed")
             return None
         except Exception as e:
             logger.error(f"Error processing image {url}: {e}")
-            self.stats["failed"] += 1
+            self._count("failed")
+            return None
+    
+    def download_image_path(self, url: str) -> Optional[Path]:
+        """
+        Download an image into the local cache without decoding it.
+        
+        The response body is written to disk as received; callers that
+        only need the file (or decode it later, once) skip PIL entirely.
+        
+        Args:
+            url: Image URL
+        
+        Returns:
+            Path of the cached file, or None if failed. Cache hits are not
+            checked on disk; a caller that cannot read the file should
+            _forget the URL.
+        """
+        cached = self._lookup_paths([url]).get(url)
+        if cached is not None:
+            self._count("cached")
+            return cached
+        
+        path = self._download_to_cache(url)
+        if path is not None:
+            self._count("downloaded")
+        return path
+    
+    def _download_to_cache(self, url: str) -> Optional[Path]:
+        """
+        Stream url into its cache file and index it; the cache is not consulted.
+        
+        Failures are counted here, successes by the caller, which may
+        still reject the body when it decodes it.
+        """
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                # Verify content type
+                content_type = response.headers.get("Content-Type", "")
+                if not content_type.startswith("image/"):
+                    logger.warning(f"Non-image content type: {content_type}")
+                    return None
+                
+                # Write beside the cache file first, so a partial download is never served
+                cache_path = self._get_cache_path(url, content_type)
+                part_path = cache_path.with_name(cache_path.name + ".part")
+                with open(part_path, "wb") as f:
+                    f.writelines(response.iter_content(chunk_size=64 * 1024))
+                os.replace(part_path, cache_path)
+            self._record(url, cache_path)
+            return cache_path
+            
+        except requests.RequestException as e:
+            logger.warning(f"Failed to download image {url}: {e}")
+            self._count("failed")
+            return None
+        except OSError as e:
+            logger.error(f"Error caching image {url}: {e}")
+            self._count("failed")
             return None
     
     def download_batch(
         self,
         urls: List[str],
-        save_local: bool = True
+        save_local: bool = True,
+        target_size: Optional[Tuple[int, int]] = None
     ) -> Dict[str, Optional[Image.Image]]:
         """
         Download multiple images in parallel.
@@ -130,15 +329,127 @@ class ImageProcessor:
         Args:
             urls: List of image URLs
             save_local: Whether to cache locally
+            target_size: Exact output size, as for download_image
+        
+        Returns:
+            Dict mapping URL to PIL Image (or None if failed)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.download_batch_async(urls, save_local, target_size))
+        
+        # Already inside an event loop (callers should await download_batch_async)
+        return self._map_urls(lambda url: self.download_image(url, save_local, target_size), urls)
+    
+    async def download_batch_async(
+        self,
+        urls: List[str],
+        save_local: bool = True,
+        target_size: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Optional[Image.Image]]:
+        """
+        Download multiple images concurrently on one async HTTP client.
+        
+        Requests share one connection pool (HTTP/2 when available), while
+        decoding runs on the default executor alongside later fetches.
+        
+        Args:
+            urls: List of image URLs
+            save_local: Whether to cache locally
+            target_size: Exact output size, as for download_image
         
         Returns:
             Dict mapping URL to PIL Image (or None if failed)
         """
+        async with httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_KEEPALIVE
+            ),
+            timeout=self.timeout,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True
+        ) as client:
+            # Resolve every cache hit with one query
+            cached = self._lookup_paths(urls)
+            images = await asyncio.gather(*[
+                self._fetch(client, url, save_local, target_size, cached.get(url))
+                for url in urls
+            ])
+        
+        return dict(zip(urls, images))
+    
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        save_local: bool,
+        target_size: Optional[Tuple[int, int]],
+        cached: Optional[Path] = None
+    ) -> Optional[Image.Image]:
+        """Fetch and decode one image for download_batch_async, or decode its cached file."""
+        loop = asyncio.get_running_loop()
+        try:
+            if cached is not None:
+                try:
+                    image = await loop.run_in_executor(None, self._decode, cached, target_size)
+                    self._count("cached")
+                    return image
+                except FileNotFoundError:
+                    # Deleted behind the index's back; download it again
+                    self._forget(url)
+            
+            response = await client.get(url)
+            response.raise_for_status()
+            
+            # Verify content type
+            content_type = response.headers.get("Content-Type", "")
+            if not content_type.startswith("image/"):
+                logger.warning(f"Non-image content type: {content_type}")
+                return None
+            
+            image = await loop.run_in_executor(
+                None, self._store_and_decode, url, response.content, content_type, save_local, target_size
+            )
+            
+            self._count("downloaded")
+            return image
+            
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to download image {url}: {e}")
+            self._count("failed")
+            return None
+        except Exception as e:
+            logger.error(f"Error processing image {url}: {e}")
+            self._count("failed")
+            return None
+    
+    def download_path_batch(self, urls: List[str]) -> Dict[str, Optional[Path]]:
+        """
+        Download multiple images into the cache in parallel, without decoding.
+        
+        Returns:
+            Dict mapping URL to cached file path (or None if failed)
+        """
+        # Resolve every cache hit with one query, then download the rest
+        results: Dict[str, Optional[Path]] = dict(self._lookup_paths(urls))
+        self._count("cached", len(results))
+        
+        missing = [url for url in dict.fromkeys(urls) if url not in results]
+        downloaded = self._map_urls(self._download_to_cache, missing)
+        self._count("downloaded", sum(path is not None for path in downloaded.values()))
+        results.update(downloaded)
+        return {url: results[url] for url in urls}
+    
+    def _map_urls(self, fn, urls: List[str]) -> Dict[str, Any]:
+        """Run fn over urls on the download pool, mapping each URL to its result."""
         results = {}
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             future_to_url = {
-                executor.submit(self.download_image, url, save_local): url
+                executor.submit(fn, url): url
                 for url in urls
             }
             
@@ -159,12 +470,44 @@ class ImageProcessor:
         """
         Analyze image for various features.
         
+        Results are cached by pixel content (see get_image_hash), so the
+        same image is only analyzed once.
+        
         Args:
             image: PIL Image
         
         Returns:
             Dict with analysis results
         """
+        return self.analyze_batch([image])[0]
+    
+    def analyze_batch(self, images: List[Image.Image]) -> List[Dict[str, Any]]:
+        """
+        Analyze several images, looking up all cached results in one query.
+        
+        Returns:
+            One analysis dict per image, in order
+        """
+        hashes = [self.get_image_hash(image) for image in images]
+        cached = self._lookup_analyses(hashes)
+        
+        results = []
+        new: Dict[str, Dict[str, Any]] = {}
+        for image, content_hash in zip(images, hashes):
+            known = cached.get(content_hash) or new.get(content_hash)
+            if known is None:
+                analysis = self._analyze(image)
+                new[content_hash] = analysis
+            else:
+                # Format is a property of the file, not of the pixels hashed
+                analysis = {**known, "format": image.format}
+            results.append(analysis)
+        
+        self._store_analyses(new)
+        return results
+    
+    def _analyze(self, image: Image.Image) -> Dict[str, Any]:
+        """Compute analysis results for one image (uncached)."""
         analysis = {
             "width": image.width,
             "height": image.height,
@@ -173,21 +516,19 @@ class ImageProcessor:
             "aspect_ratio": round(image.width / image.height, 2),
         }
         
-        # Get dominant colors
-        try:
-            analysis["dominant_colors"] = self._get_dominant_colors(image)
-        except Exception:
-            analysis["dominant_colors"] = []
+        # Convert once; every measure below reads this RGB image
+        rgb = image if image.mode == "RGB" else image.convert("RGB")
         
         # Check for text presence (simple heuristic)
         try:
-            analysis["likely_contains_text"] = self._check_text_presence(image)
+            gray = np.asarray(rgb.convert("L"), dtype=np.int16)
+            analysis["likely_contains_text"] = self._gray_contains_text(gray)
         except Exception:
             analysis["likely_contains_text"] = None
         
-        # Image statistics
+        # Image statistics (histogram-based, so one cheap pass)
         try:
-            stat = ImageStat.Stat(image)
+            stat = ImageStat.Stat(rgb)
             analysis["brightness"] = round(sum(stat.mean) / 3, 2)
             analysis["contrast"] = round(sum(stat.stddev) / 3, 2)
         except Exception:
@@ -199,6 +540,17 @@ class ImageProcessor:
         except Exception:
             analysis["image_type"] = "unknown"
         
+        # Get dominant colors: clustered palettes for text-bearing graphics,
+        # one perceptual mean color for everything else
+        try:
+            pixels = self._color_sample(rgb)
+            if analysis["image_type"] in PALETTE_IMAGE_TYPES:
+                analysis["dominant_colors"] = self._palette(pixels)
+            else:
+                analysis["dominant_colors"] = self._mean_color(pixels)
+        except Exception:
+            analysis["dominant_colors"] = []
+        
         return analysis
     
     def prepare_for_clip(
@@ -219,69 +571,304 @@ class ImageProcessor:
             image = image.convert("RGB")
         
         # Resize to CLIP input size
-        image = image.resize(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+        image = image.resize(THUMBNAIL_SIZE, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
         
         return image
     
+    def load_for_clip(self, url: str) -> Optional[np.ndarray]:
+        """
+        Load an image as a CLIP-ready uint8 array (THUMBNAIL_SIZE, RGB).
+        
+        The array is cached beside the downloaded image, so repeat calls
+        skip both decoding and resizing; hits are memory-mapped.
+        
+        Args:
+            url: Image URL
+        
+        Returns:
+            Array of shape (height, width, 3), or None if the download failed
+        """
+        try:
+            return np.load(self._clip_cache_path(url), mmap_mode="r")
+        except FileNotFoundError:
+            pass
+        
+        image = self.download_image(url, target_size=THUMBNAIL_SIZE)
+        if image is None:
+            return None
+        return self._store_clip_array(url, image)
+    
+    def _clip_array(self, url: str, image: Image.Image) -> np.ndarray:
+        """CLIP-ready array for an already decoded image, from the cache when present."""
+        try:
+            return np.load(self._clip_cache_path(url), mmap_mode="r")
+        except FileNotFoundError:
+            return self._store_clip_array(url, self.prepare_for_clip(image))
+    
+    def _store_clip_array(self, url: str, clip_image: Image.Image) -> np.ndarray:
+        """Cache a CLIP-ready image as an array and return the array."""
+        array = np.asarray(clip_image, dtype=np.uint8)
+        path = self._clip_cache_path(url)
+        part_path = path.with_name(path.name + ".part")
+        try:
+            with open(part_path, "wb") as f:
+                np.save(f, array)
+            os.replace(part_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache CLIP array: {e}")
+        return array
+    
+    def _clip_cache_path(self, url: str) -> Path:
+        """CLIP-ready array file for URL; size and version are part of the name."""
+        width, height = THUMBNAIL_SIZE
+        return self.cache_dir / f"{self._url_hash(url)}.clip-{width}x{height}-v{CLIP_CACHE_VERSION}.npy"
+    
     def get_image_hash(self, image: Image.Image) -> str:
-        """Generate unique hash for an image."""
-        return hashlib.md5(image.tobytes()).hexdigest()
+        """Generate unique hash for an image's mode, size and pixels."""
+        # Non-cryptographic: these are cache keys, and xxh3 runs near memory speed
+        digest = xxhash.xxh3_128(f"{image.mode}:{image.size}".encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+    
+    def _url_hash(self, url: str) -> str:
+        """Cache key for a URL."""
+        return xxhash.xxh3_128_hexdigest(url.encode())
     
-    def _get_cache_path(self, url: str) -> Path:
-        """Generate cache file path for URL."""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        # Get extension from URL
+    def _get_cache_path(self, url: str, content_type: Optional[str] = None) -> Path:
+        """Generate cache file path for URL, keeping the source format's extension."""
+        url_hash = self._url_hash(url)
+        # Get extension from URL, else from the response's content type
         ext = Path(url.split("?")[0]).suffix.lower()
+        if ext not in SUPPORTED_FORMATS and content_type:
+            ext = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
         if ext not in SUPPORTED_FORMATS:
             ext = ".jpg"
         return self.cache_dir / f"{url_hash}{ext}"
     
-    def _save_to_cache(self, image: Image.Image, path: Path) -> None:
-        """Save image to cache."""
+    def cached_path(self, url: str) -> Optional[Path]:
+        """Return the cached file for URL, or None if it is not cached."""
+        return self._lookup_paths([url]).get(url)
+    
+    def _decode(self, source: Any, target_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        Decode an image file or buffer to RGB at the size the caller needs.
+        
+        Args:
+            source: Path, file object or opened (not yet loaded) image
+            target_size: Exact output size; None fits within MAX_IMAGE_SIZE
+        
+        Returns:
+            RGB PIL Image
+        """
+        image = source if isinstance(source, Image.Image) else Image.open(source)
+        
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when that still covers the target
+        image.draft("RGB", target_size or MAX_IMAGE_SIZE)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        
+        if target_size is not None:
+            return image.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+        if image.size[0] > MAX_IMAGE_SIZE[0] or image.size[1] > MAX_IMAGE_SIZE[1]:
+            image.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+        return image
+    
+    def _store_and_decode(
+        self,
+        url: str,
+        body: bytes,
+        content_type: str,
+        save_local: bool,
+        target_size: Optional[Tuple[int, int]]
+    ) -> Image.Image:
+        """Decode a downloaded body, caching it the same way download_image does."""
+        if not save_local:
+            return self._decode(BytesIO(body), target_size)
+        
+        # Write beside the cache file first, so a partial write is never served
+        cache_path = self._get_cache_path(url, content_type)
+        part_path = cache_path.with_name(cache_path.name + ".part")
+        part_path.write_bytes(body)
+        os.replace(part_path, cache_path)
+        self._record(url, cache_path)
+        return self._decode_download(url, cache_path, target_size)
+    
+    def _decode_download(
+        self,
+        url: str,
+        path: Path,
+        target_size: Optional[Tuple[int, int]]
+    ) -> Image.Image:
+        """
+        Decode a freshly cached download.
+        
+        The original bytes stay cached unless decoding had to shrink the
+        image to MAX_IMAGE_SIZE; then the smaller image replaces them, in
+        the source format. A body that does not decode is dropped from
+        the cache before the error propagates.
+        """
+        try:
+            with Image.open(path) as source:
+                source_size, source_format = source.size, source.format
+                image = self._decode(source, target_size)
+                image.load()
+        except Exception:
+            path.unlink(missing_ok=True)
+            self._forget(url)
+            raise
+        
+        # target_size outputs are derived views; the cache keeps the full image
+        if target_size is None and image.size != source_size:
+            self._save_to_cache(image, path, source_format)
+            self._record(url, path)
+        return image
+    
+    def _lookup_paths(self, urls: List[str]) -> Dict[str, Path]:
+        """Map the cached subset of urls to their files, in one index query per 500 URLs."""
+        hashes = {self._url_hash(url): url for url in urls}
+        found = {}
+        with self._index_lock:
+            keys = list(hashes)
+            # Stay under sqlite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self._index.execute(
+                    f"SELECT url_hash, path FROM images WHERE url_hash IN ({placeholders})",
+                    chunk
+                ).fetchall())
+        return {hashes[url_hash]: Path(path) for url_hash, path in found.items()}
+    
+    def _record(self, url: str, path: Path) -> None:
+        """Index a file just written to the cache."""
         try:
-            image.save(path, quality=90)
+            stat = path.stat()
+        except OSError:
+            # Nothing was written (e.g. _save_to_cache failed)
+            return
+        with self._index_lock:
+            self._index.execute(
+                "INSERT OR REPLACE INTO images (url_hash, path, size, mtime) VALUES (?, ?, ?, ?)",
+                (self._url_hash(url), str(path), stat.st_size, int(stat.st_mtime))
+            )
+            self._index.commit()
+    
+    def _forget(self, url: str) -> None:
+        """Drop a URL from the index."""
+        with self._index_lock:
+            self._index.execute("DELETE FROM images WHERE url_hash = ?", (self._url_hash(url),))
+            self._index.commit()
+    
+    def _lookup_analyses(self, hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Map the cached subset of content hashes to their analyses."""
+        keys_to_hashes = {self._analysis_key(content_hash): content_hash for content_hash in hashes}
+        found = {}
+        with self._index_lock:
+            keys = list(keys_to_hashes)
+            # Stay under sqlite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self._index.execute(
+                    f"SELECT content_hash, analysis FROM analyses WHERE content_hash IN ({placeholders})",
+                    chunk
+                ).fetchall())
+        return {keys_to_hashes[key]: orjson.loads(analysis) for key, analysis in found.items()}
+    
+    def _store_analyses(self, analyses: Dict[str, Dict[str, Any]]) -> None:
+        """Cache analyses by content hash and ANALYSIS_VERSION."""
+        if not analyses:
+            return
+        with self._index_lock:
+            self._index.executemany(
+                "INSERT OR REPLACE INTO analyses (content_hash, analysis) VALUES (?, ?)",
+                [
+                    (self._analysis_key(content_hash), orjson.dumps(analysis))
+                    for content_hash, analysis in analyses.items()
+                ]
+            )
+            self._index.commit()
+    
+    def _analysis_key(self, content_hash: str) -> str:
+        """Analyses row key; the version is part of it, as for CLIP arrays."""
+        return f"{content_hash}-v{ANALYSIS_VERSION}"
+    
+    def _save_to_cache(
+        self,
+        image: Image.Image,
+        path: Path,
+        image_format: Optional[str] = None
+    ) -> None:
+        """Save image to cache, in image_format (default: from the extension)."""
+        image_format = image_format or Image.registered_extensions().get(path.suffix, "JPEG")
+        part_path = path.with_name(path.name + ".part")
+        try:
+            if image_format == "JPEG":
+                # Single-pass baseline encode; no extra Huffman optimization pass
+                image.save(part_path, "JPEG", quality=90, optimize=False, progressive=False)
+            else:
+                image.save(part_path, image_format)
+            os.replace(part_path, path)
         except Exception as e:
             logger.warning(f"Failed to cache image: {e}")
+            part_path.unlink(missing_ok=True)
     
     def _get_dominant_colors(
         self,
         image: Image.Image,
         num_colors: int = 3
     ) -> List[str]:
-        """Extract dominant colors as hex strings."""
-        # Resize for faster processing
-        small = image.copy()
-        small.thumbnail((100, 100))
-        
-        # Quantize to get palette
-        quantized = small.quantize(colors=num_colors)
-        palette = quantized.getpalette()
-        
-        # Extract top colors
-        colors = []
-        for i in range(num_colors):
-            r, g, b = palette[i*3:(i+1)*3]
-            colors.append(f"#{r:02x}{g:02x}{b:02x}")
+        """Extract dominant colors as hex strings, most common first."""
+        return self._palette(self._color_sample(image), num_colors)
+    
+    def _palette(self, pixels: np.ndarray, num_colors: int = 3) -> List[str]:
+        """Cluster sampled pixels into hex colors, most common first."""
+        # Centers are pixel-weighted means of actual pixels, unlike
+        # median-cut palette entries
+        centers, labels = _kmeans(pixels, num_colors)
+        order = np.argsort(-np.bincount(labels, minlength=len(centers)), kind="stable")
         
-        return colors
+        rgb = np.clip(np.rint(centers[order]), 0, 255).astype(np.uint32)
+        return self._format_colors(rgb)
+    
+    def _mean_color(self, pixels: np.ndarray) -> List[str]:
+        """Mean color of sampled pixels in CIE Lab, which averages perceptually, as a one-item hex list."""
+        lab_mean = _srgb_to_lab(pixels.astype(np.float64)).mean(axis=0)
+        rgb = np.clip(np.rint(_lab_to_srgb(lab_mean[None, :])), 0, 255).astype(np.uint32)
+        return self._format_colors(rgb)
+    
+    def _color_sample(self, image: Image.Image) -> np.ndarray:
+        """Nearest-neighbour sample of actual pixels, as an (n, 3) float32 RGB array."""
+        small = image if image.mode == "RGB" else image.convert("RGB")
+        small = small.resize(COLOR_SAMPLE_SIZE, Image.Resampling.NEAREST)
+        return np.asarray(small, dtype=np.float32).reshape(-1, 3)
+    
+    def _format_colors(self, rgb: np.ndarray) -> List[str]:
+        """Hex strings for an (n, 3) uint32 RGB array."""
+        # Pack each color into one 0xRRGGBB integer, then format once per color
+        packed = rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2]
+        return [f"#{value:06x}" for value in packed.tolist()]
     
     def _check_text_presence(self, image: Image.Image) -> bool:
         """
         Simple heuristic to detect if image likely contains text.
         Uses edge detection - text-heavy images have more edges.
         """
-        # Convert to grayscale
-        gray = image.convert("L")
-        
-        # Apply edge detection
-        edges = gray.filter(ImageFilter.FIND_EDGES)
+        # Grayscale as int16 so the differences below cannot wrap
+        return self._gray_contains_text(np.asarray(image.convert("L"), dtype=np.int16))
+    
+    def _gray_contains_text(self, gray: np.ndarray) -> bool:
+        """Edge-density text check on an int16 grayscale array."""
+        if gray.shape[0] < 3 or gray.shape[1] < 3:
+            return False
         
-        # Calculate edge density
-        edge_array = np.array(edges)
-        edge_density = np.mean(edge_array > 50)  # Threshold for edge pixels
+        # Central-difference gradient magnitude (L1) over the interior pixels
+        magnitude = np.abs(gray[1:-1, 2:] - gray[1:-1, :-2])
+        magnitude += np.abs(gray[2:, 1:-1] - gray[:-2, 1:-1])
         
         # Text-heavy images typically have edge density > 0.1
-        return edge_density > 0.1
+        edge_density = np.count_nonzero(magnitude > 50) / magnitude.size
+        return bool(edge_density > 0.1)
     
     def _detect_image_type(
         self,
@@ -290,10 +877,10 @@ class ImageProcessor:
     ) -> str:
         """Detect type of image (photo, screenshot, meme, etc.)."""
         width, height = image.size
-        aspect = analysis.get("aspect_ratio", 1.0)
         
-        # Screenshot detection: usually specific aspect ratios
-        if aspect in [1.78, 2.17, 2.16]:  # 16:9, phone ratios
+        # Screenshot detection: usually specific aspect ratios. Integer form of
+        # round(width / height, 2) == ratio / 100, free of float comparisons
+        if any(abs(200 * width - 2 * ratio * height) < height for ratio in SCREENSHOT_ASPECTS):
             if analysis.get("likely_contains_text", False):
                 return "screenshot"
         
@@ -301,8 +888,8 @@ class ImageProcessor:
         if height > width * 2 and analysis.get("likely_contains_text", False):
             return "infographic"
         
-        # Meme: square-ish with text
-        if 0.8 < aspect < 1.3 and analysis.get("likely_contains_text", False):
+        # Meme: square-ish (0.8 < width / height < 1.3) with text
+        if 4 * height < 5 * width and 10 * width < 13 * height and analysis.get("likely_contains_text", False):
             return "meme"
         
         # Default to photo
@@ -311,73 +898,131 @@ class ImageProcessor:
     def clear_cache(self) -> int:
         """Clear image cache. Returns number of files deleted."""
         count = 0
-        for f in self.cache_dir.iterdir():
-            if f.is_file():
-                f.unlink()
-                count += 1
+        # DirEntry.is_file() reads the file type from the directory listing;
+        # only symlinks still need a stat()
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith(INDEX_FILENAME):
+                    os.unlink(entry.path)
+                    count += 1
+        with self._index_lock:
+            self._index.execute("DELETE FROM images")
+            self._index.execute("DELETE FROM analyses")
+            self._index.commit()
         return count
     
     def get_stats(self) -> Dict[str, int]:
         """Get download statistics."""
-        return self.stats.copy()
+        with self._stats_lock:
+            return self.stats.copy()
+    
+    def _count(self, name: str, n: int = 1) -> None:
+        """Add n to a download statistic."""
+        with self._stats_lock:
+            self.stats[name] += n
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections and the cache index."""
+        self.session.close()
+        with self._index_lock:
+            self._index.close()
+    
+    def __enter__(self) -> Self:
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Global instance (lazy loaded)
+_processor_instance: Optional[ImageProcessor] = None
+
+
+def get_image_processor() -> ImageProcessor:
+    """Get or create the global image processor, sharing its connections and cache index."""
+    global _processor_instance
+    
+    if _processor_instance is None:
+        _processor_instance = ImageProcessor()
+    
+    return _processor_instance
 
 
 # Convenience functions
 
 def download_image(url: str, cache: bool = True) -> Optional[Image.Image]:
     """Download a single image."""
-    processor = ImageProcessor()
-    return processor.download_image(url, save_local=cache)
+    return get_image_processor().download_image(url, save_local=cache)
 
 
 def analyze_image(image: Image.Image) -> Dict[str, Any]:
     """Analyze a single image."""
-    processor = ImageProcessor()
-    return processor.analyze_image(image)
+    return get_image_processor().analyze_image(image)
 
 
 def process_tweet_images(
     image_urls: List[str],
-    cache_dir: str = DEFAULT_CACHE_DIR
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    processor: Optional[ImageProcessor] = None
 ) -> List[Dict[str, Any]]:
     """
     Process all images from a tweet.
     
     Args:
         image_urls: List of image URLs from tweet
-        cache_dir: Cache directory
+        cache_dir: Cache directory (ignored when processor is given)
+        processor: Processor to reuse across tweets; by default the shared
+            one (see get_image_processor) for the default cache_dir, else a
+            temporary one created for cache_dir and closed afterwards
     
     Returns:
         List of processed image data dicts
     """
-    processor = ImageProcessor(cache_dir=cache_dir)
     results = []
     
-    # Download all images
-    images = processor.download_batch(image_urls)
+    if processor is not None:
+        context = contextlib.nullcontext(processor)
+    elif cache_dir == DEFAULT_CACHE_DIR:
+        context = contextlib.nullcontext(get_image_processor())
+    else:
+        context = ImageProcessor(cache_dir=cache_dir)
     
-    for url, image in images.items():
-        if image is None:
-            results.append({
-                "url": url,
-                "success": False,
-                "error": "Download failed"
-            })
-            continue
+    with context as active:
+        # Download all images to the cache; each is decoded once, below
+        paths = active.download_path_batch(image_urls)
         
-        # Analyze image
-        analysis = processor.analyze_image(image)
+        images = {}
+        for url, path in paths.items():
+            if path is None:
+                continue
+            try:
+                images[url] = active._decode(path)
+            except Exception as e:
+                logger.warning(f"Failed to decode cached image {path}: {e}")
+                # Missing or unreadable; let the next call download it again
+                active._forget(url)
         
-        # Prepare for CLIP
-        clip_ready = processor.prepare_for_clip(image)
+        # Analyze images, resolving previously analyzed ones in one lookup
+        analyses = dict(zip(images, active.analyze_batch(list(images.values()))))
         
-        results.append({
-            "url": url,
-            "success": True,
-            "image": clip_ready,
-            "analysis": analysis,
-            "local_path": str(processor._get_cache_path(url)),
-        })
+        for url, path in paths.items():
+            if url not in images:
+                results.append({
+                    "url": url,
+                    "success": False,
+                    "error": "Download failed"
+                })
+                continue
+            
+            # Prepare for CLIP
+            clip_ready = Image.fromarray(active._clip_array(url, images[url]))
+            
+            results.append({
+                "url": url,
+                "success": True,
+                "image": clip_ready,
+                "analysis": analyses[url],
+                "local_path": str(path),
+            })
     
     return results
-
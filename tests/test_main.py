@@ -87,6 +87,19 @@ class TestEmbeddings:
         assert isinstance(vectors, list)
         assert len(vectors) == 3
     
+    def test_array_encoding(self):
+        """Test encoding multiple texts to a float32 matrix."""
+        from src.embeddings import get_embedding_model
+        import numpy as np
+        
+        pytest.importorskip("sentence_transformers")
+        
+        model = get_embedding_model()
+        vectors = model.encode_array(["test one", "test two"])
+        
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (2, model.vector_size)
+    
     def test_similarity_calculation(self):
         """Test similarity calculation."""
         from src.embeddings import EmbeddingModel
@@ -255,6 +268,152 @@ class TestTimelineBuilder:
         assert builder is not None
         assert builder.search_limit == 10
     
+    def test_context_pruning(self, qdrant_client):
+        """Test pruning context to the top-ranked items."""
+        from src.timeline_builder import TimelineBuilder
+        
+        builder = TimelineBuilder(qdrant_client, use_multimodal=False)
+        context = [
+            {"text": "low", "relevance_score": 0.2, "credibility_score": 0.3},
+            {"text": "high", "relevance_score": 0.9, "credibility_score": 0.9},
+            {"text": "mid", "relevance_score": 0.6, "credibility_score": 0.5},
+        ]
+        
+        pruned = builder._prune_context(context, 2)
+        
+        assert [item["text"] for item in pruned] == ["high", "mid"]
+        assert builder._prune_context(context, 5) is context
+    
+    def test_context_keeps_ranked_order(self, qdrant_client):
+        """Test that formatted context lists items in ranked order."""
+        import orjson
+        from src.timeline_builder import TimelineBuilder
+        
+        builder = TimelineBuilder(qdrant_client, use_multimodal=False)
+        context = [{"tweet_id": "9", "text": "best"}, {"tweet_id": "1", "text": "next"}]
+        
+        assert [item["text"] for item in orjson.loads(builder._format_context(context))] == ["best", "next"]
+    
+    async def test_search_failure_is_not_cached_as_empty(self, monkeypatch):
+        """Test that a failed search neither ingests mock data nor caches an empty result."""
+        from types import SimpleNamespace
+        from qdrant_client import QdrantClient
+        from src.timeline_builder import TimelineBuilder
+        
+        async def unavailable(*args, **kwargs):
+            raise ConnectionError("Qdrant unavailable")
+        
+        builder = TimelineBuilder(QdrantClient(":memory:"), use_multimodal=False)
+        ingests = []
+        monkeypatch.setattr(builder.searcher, "asearch_batch", unavailable)
+        monkeypatch.setattr(builder, "_ingest_mock_data", lambda: ingests.append(True))
+        processed = SimpleNamespace(original_query="floods", rewritten_query="floods", entities=[])
+        
+        assert await builder._retrieve_or_ingest(processed, None, 5) == []
+        assert ingests == []
+        assert len(builder._empty_context_cache) == 0
+    
+    async def test_raw_query_context_is_only_a_fallback(self, monkeypatch):
+        """Test that the speculative raw-query search is used only when the rewrite finds nothing."""
+        from types import SimpleNamespace
+        from qdrant_client import QdrantClient
+        from src.timeline_builder import TimelineBuilder
+        
+        hits = {
+            "mumbai flood": [SimpleNamespace(score=0.9, payload={"tweet_id": "1", "text": "raw hit"})],
+            "Mumbai floods July 2024": [SimpleNamespace(score=0.8, payload={"tweet_id": "2", "text": "rewrite hit"})],
+        }
+        rewrites = {"mumbai flood": "Mumbai floods July 2024", "mumbai flood relief": "Mumbai flood relief camps"}
+        
+        async def search(queries, limit, filters):
+            return [hits.get(query, []) for query in queries]
+        
+        async def process(query):
+            return SimpleNamespace(original_query=query, rewritten_query=rewrites[query], entities=[])
+        
+        builder = TimelineBuilder(QdrantClient(":memory:"), use_multimodal=False)
+        ingests = []
+        monkeypatch.setattr(builder.searcher, "asearch_batch", search)
+        monkeypatch.setattr(builder, "_process_query", process)
+        monkeypatch.setattr(builder, "_ingest_mock_data", lambda: ingests.append(True))
+        
+        _, context_str, placeholder = await builder._prepare_generation("mumbai flood", 5, None)
+        assert "rewrite hit" in context_str and "raw hit" not in context_str
+        assert not placeholder
+        
+        hits["mumbai flood relief"] = hits.pop("mumbai flood")
+        _, context_str, placeholder = await builder._prepare_generation("mumbai flood relief", 5, None)
+        assert "raw hit" in context_str and not placeholder
+        assert ingests == []
+    
+    def test_ingest_mock_data_without_optional_columns(self, config, tmp_path):
+        """Test ingesting a mock file that only has the core columns."""
+        from qdrant_client import QdrantClient, models
+        from src.embeddings import get_embedding_model
+        from src.timeline_builder import TimelineBuilder
+        
+        path = tmp_path / "posts.csv"
+        path.write_text(
+            "tweet_id,text,author,timestamp\n"
+            "1,Flood waters rise,reporter,2024-07-01\n"
+            ",Rescue boats arrive,witness,2024-07-02\n"
+        )
+        client = QdrantClient(":memory:")
+        client.create_collection(
+            config.collection_posts,
+            vectors_config=models.VectorParams(
+                size=get_embedding_model().get_vector_size(),
+                distance=models.Distance.COSINE,
+            ),
+        )
+        builder = TimelineBuilder(client, use_multimodal=False)
+        
+        assert builder.ingest_mock_data(str(path)) == 2
+        
+        points, _ = client.scroll(config.collection_posts, limit=10)
+        payloads = {point.payload["tweet_id"]: point.payload for point in points}
+        assert set(payloads) == {"1", "mock_1"}
+        assert payloads["1"]["credibility_score"] == 0.5
+        assert payloads["1"]["is_verified"] is False
+        assert payloads["mock_1"]["location"] is None
+    
+    async def test_repeated_timeline_is_cached(self, qdrant_client, monkeypatch):
+        """Test that identical timeline requests reuse the generated timeline."""
+        from pydantic import BaseModel
+        from src import timeline_builder
+        
+        class FakeTimeline(BaseModel):
+            topic: str
+            events: list = []
+        
+        calls = []
+        
+        class FakeBaml:
+            async def GenerateTimeline(self, query, retrieved_context, num_events):
+                calls.append(query)
+                return FakeTimeline(topic=query)
+        
+        async def prepare(query, limit, filters):
+            # Nothing is indexed about Atlantis, so it gets the placeholder context
+            return type("Processed", (), {"rewritten_query": query})(), "[]", query.startswith("Atlantis")
+        
+        monkeypatch.setattr(timeline_builder, "b", FakeBaml())
+        builder = timeline_builder.TimelineBuilder(qdrant_client, use_multimodal=False)
+        monkeypatch.setattr(builder, "_prepare_generation", prepare)
+        monkeypatch.setattr(builder, "_spawn_followup_prefetch", lambda processed: None)
+        
+        first = await builder.build_timeline("Mumbai floods", limit=5)
+        second = await builder.build_timeline("  mumbai   FLOODS ", limit=5)
+        await builder.build_timeline("Mumbai floods", limit=3)
+        
+        assert calls == ["Mumbai floods", "Mumbai floods"]
+        assert second == first and second is not first
+        
+        await builder.build_timeline("Atlantis floods", limit=5)
+        await builder.build_timeline("Atlantis floods", limit=5)
+        
+        assert calls[2:] == ["Atlantis floods", "Atlantis floods"]
+    
     @pytest.mark.skipif(
         sys.version_info < (3, 8),
         reason="Requires Python 3.8+"
@@ -273,6 +432,321 @@ class TestTimelineBuilder:
         assert hasattr(processed, "rewritten_query")
 
 
+class TestBatching:
+    """Tests for async request batching."""
+    
+    async def test_concurrent_submissions_are_batched(self):
+        """Test that concurrent submissions share batches."""
+        import asyncio
+        from src.utils.batching import AsyncBatcher
+        
+        batches = []
+        
+        class DoublingBatcher(AsyncBatcher):
+            async def process_batch(self, items):
+                batches.append(list(items))
+                return [item * 2 for item in items]
+        
+        batcher = DoublingBatcher(max_batch_size=3, max_queue_time=0.01)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        
+        assert results == [0, 2, 4, 6, 8]
+        assert batches == [[0, 1, 2], [3, 4]]
+    
+    async def test_processed_queries_matched_by_query(self, monkeypatch):
+        """Test that batched results are matched by query, with per-query fallback."""
+        import asyncio
+        from types import SimpleNamespace
+        from src import timeline_builder
+        
+        single_calls = []
+        
+        class FakeBaml:
+            async def ProcessQueryBatch(self, queries):
+                # Out of order, one query echoed back altered, one dropped
+                return [SimpleNamespace(original_query="b"), SimpleNamespace(original_query="A")]
+            
+            async def ProcessQuery(self, original_query):
+                single_calls.append(original_query)
+                if original_query == "c":
+                    raise RuntimeError("LLM unavailable")
+                return SimpleNamespace(original_query=original_query)
+        
+        monkeypatch.setattr(timeline_builder, "b", FakeBaml())
+        batcher = timeline_builder.ProcessQueryBatcher(max_batch_size=3, max_queue_time=0.01)
+        results = await asyncio.gather(*(batcher.submit(q) for q in "abc"), return_exceptions=True)
+        
+        assert [result.original_query for result in results[:2]] == ["a", "b"]
+        assert isinstance(results[2], RuntimeError)
+        assert sorted(single_calls) == ["a", "c"]
+
+
+class TestEmbeddingCache:
+    """Tests for the persistent embedding cache."""
+    
+    def test_only_misses_are_computed(self, tmp_path):
+        """Test that cached vectors are reused and misses computed once."""
+        import numpy as np
+        from src.utils.embedding_cache import EmbeddingCache, content_key
+        
+        cache = EmbeddingCache(cache_dir=str(tmp_path))
+        keys = [content_key("a"), content_key("b")]
+        computed = []
+        
+        def compute(missing):
+            computed.append(missing)
+            return np.ones((len(missing), 4)) * np.array(missing)[:, None]
+        
+        first = cache.get_or_compute_many(keys, compute, namespace="test")
+        second = cache.get_or_compute_many(keys + [content_key("c")], compute, namespace="test")
+        
+        assert computed == [[0, 1], [2]]
+        assert second.shape == (3, 4)
+        np.testing.assert_array_equal(first, second[:2])
+    
+    def test_least_recently_used_is_evicted(self, tmp_path, monkeypatch):
+        """Test that a full namespace recycles its least recently used row."""
+        import numpy as np
+        from src.utils import embedding_cache
+        from src.utils.embedding_cache import EmbeddingCache
+        
+        monkeypatch.setattr(embedding_cache, "TOUCH_INTERVAL", 0.0)
+        cache = EmbeddingCache(cache_dir=str(tmp_path), max_rows=2)
+        cache.put_many("test", [b"a", b"b"], np.zeros((2, 4)))
+        cache.get_many("test", [b"a"])
+        cache.put_many("test", [b"c"], np.ones((1, 4)))
+        
+        a, b, c = cache.get_many("test", [b"a", b"b", b"c"])
+        assert a is not None and b is None and c is not None
+    
+    def test_batch_larger_than_max_rows(self, tmp_path):
+        """Test that oversized batches cache what fits and never share rows."""
+        import numpy as np
+        from src.utils.embedding_cache import EmbeddingCache
+        
+        cache = EmbeddingCache(cache_dir=str(tmp_path), max_rows=2)
+        vectors = cache.get_or_compute_many(
+            [b"a", b"b", b"c"],
+            lambda missing: np.array(missing, dtype=np.float32)[:, None] * np.ones((1, 4)),
+            namespace="test"
+        )
+        np.testing.assert_array_equal(vectors[:, 0], [0, 1, 2])
+        assert sum(v is not None for v in cache.get_many("test", [b"a", b"b", b"c"])) == 2
+        
+        single = EmbeddingCache(cache_dir=str(tmp_path / "single"), max_rows=1)
+        single.put_many("test", [b"a"], np.zeros((1, 4)))
+        single.put_many("test", [b"a", b"b"], np.stack([np.full(4, 1.0), np.full(4, 2.0)]))
+        
+        a, b = single.get_many("test", [b"a", b"b"])
+        np.testing.assert_array_equal(a, np.full(4, 1.0))
+        assert b is None
+    
+    def test_hits_refresh_last_used_at_most_once_per_interval(self, tmp_path):
+        """Test that repeated cache hits do not rewrite the index."""
+        import numpy as np
+        from src.utils.embedding_cache import EmbeddingCache
+        
+        cache = EmbeddingCache(cache_dir=str(tmp_path))
+        cache.put_many("test", [b"a"], np.zeros((1, 4)))
+        changes = cache._db.total_changes
+        cache.get_many("test", [b"a"])
+        
+        assert cache._db.total_changes == changes
+    
+    def test_shared_directory_across_instances(self, tmp_path):
+        """Test that caches sharing a directory never hand out the same row."""
+        import threading
+        import numpy as np
+        from src.utils.embedding_cache import GROWTH_ROWS, EmbeddingCache
+        
+        first = EmbeddingCache(cache_dir=str(tmp_path))
+        second = EmbeddingCache(cache_dir=str(tmp_path))
+        first.put_many("test", [b"seed"], np.zeros((1, 4)))
+        
+        def store(cache, prefix):
+            for i in range(20):
+                keys = [f"{prefix}{i}-{j}".encode() for j in range(GROWTH_ROWS // 8)]
+                vectors = np.array([[i, j, 0, 0] for j in range(len(keys))], dtype=np.float32)
+                cache.put_many("test", keys, vectors + (prefix == "y"))
+        
+        threads = [
+            threading.Thread(target=store, args=(first, "x")),
+            threading.Thread(target=store, args=(second, "y")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # The first cache's memmap predates the file growing past GROWTH_ROWS
+        for prefix, offset in (("x", 0), ("y", 1)):
+            keys = [f"{prefix}19-{j}".encode() for j in range(GROWTH_ROWS // 8)]
+            vectors = np.stack(first.get_many("test", keys))
+            np.testing.assert_array_equal(vectors[:, 1], np.arange(len(keys)) + offset)
+
+
+class TestImageProcessor:
+    """Tests for image processing utilities."""
+    
+    def test_dominant_colors_by_frequency(self, tmp_path):
+        """Test that dominant colors are cluster centers, most common first."""
+        import numpy as np
+        from PIL import Image
+        from src.utils.image_processor import ImageProcessor
+        
+        pixels = np.zeros((60, 100, 3), dtype=np.uint8)
+        pixels[:40] = [255, 0, 0]
+        pixels[40:55] = [0, 0, 255]
+        pixels[55:] = [0, 255, 0]
+        
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        colors = processor._get_dominant_colors(Image.fromarray(pixels))
+        
+        assert colors == ["#ff0000", "#0000ff", "#00ff00"]
+    
+    def test_text_presence_from_edge_density(self, tmp_path):
+        """Test that dense edges read as text and flat images do not."""
+        import numpy as np
+        from PIL import Image
+        from src.utils.image_processor import ImageProcessor
+        
+        stripes = np.zeros((64, 64), dtype=np.uint8)
+        stripes[:, ::4] = 255
+        
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        
+        assert processor._check_text_presence(Image.fromarray(stripes)) is True
+        assert processor._check_text_presence(Image.new("RGB", (64, 64), "white")) is False
+    
+    async def test_undecodable_download_is_not_cached(self, tmp_path, monkeypatch):
+        """Test that a body which fails to decode is dropped and counted once."""
+        import httpx
+        from src.utils.image_processor import ImageProcessor
+        
+        class FakeResponse:
+            headers = {"Content-Type": "image/png"}
+            
+            def __enter__(self):
+                return self
+            
+            def __exit__(self, *exc_info):
+                return None
+            
+            def raise_for_status(self):
+                pass
+            
+            def iter_content(self, chunk_size):
+                yield b"not an image"
+        
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        monkeypatch.setattr(processor.session, "get", lambda *args, **kwargs: FakeResponse())
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, headers=FakeResponse.headers, content=b"not an image")
+        )
+        
+        assert processor.download_image("https://example.com/a.png") is None
+        async with httpx.AsyncClient(transport=transport) as client:
+            assert await processor._fetch(client, "https://example.com/b.png", True, None) is None
+        
+        stats = processor.get_stats()
+        assert stats["downloaded"] == 0 and stats["failed"] == 2
+        assert processor.cached_path("https://example.com/a.png") is None
+        assert processor.cached_path("https://example.com/b.png") is None
+        assert not list(tmp_path.glob("*.png*"))
+    
+    def test_stats_are_exact_under_concurrent_reads(self, tmp_path):
+        """Test that concurrent counting and reading never skews the stats."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.utils.image_processor import ImageProcessor
+        
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        
+        def work(i):
+            processor._count("downloaded")
+            return processor.get_stats()
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            snapshots = list(pool.map(work, range(200)))
+        
+        assert all(0 < snapshot["downloaded"] <= 200 and snapshot["failed"] == 0 for snapshot in snapshots)
+        assert processor.get_stats() == {"downloaded": 200, "cached": 0, "failed": 0}
+    
+    def test_tweet_images_use_shared_processor_by_default(self, tmp_path, monkeypatch):
+        """Test that the default cache reuses the shared processor and leaves it open."""
+        from src.utils import image_processor
+        
+        shared = image_processor.ImageProcessor(cache_dir=str(tmp_path))
+        monkeypatch.setattr(image_processor, "_processor_instance", shared)
+        # Creating a fresh processor per tweet would now raise
+        monkeypatch.setattr(image_processor.ImageProcessor, "__init__", None)
+        
+        assert image_processor.process_tweet_images([]) == []
+        assert shared.cached_path("https://example.com/a.png") is None
+    
+    def test_missing_cached_file_is_forgotten(self, tmp_path):
+        """Test that a cached file deleted from disk is downloaded again next time."""
+        from PIL import Image
+        from src.utils.image_processor import ImageProcessor, process_tweet_images
+        
+        url = "https://example.com/a.png"
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        path = tmp_path / "a.png"
+        Image.new("RGB", (8, 8)).save(path)
+        processor._record(url, path)
+        path.unlink()
+        
+        results = process_tweet_images([url], processor=processor)
+        
+        assert results == [{"url": url, "success": False, "error": "Download failed"}]
+        assert processor.cached_path(url) is None
+    
+    def test_clip_array_is_cached(self, tmp_path):
+        """Test that CLIP-ready arrays are stored once and reused."""
+        from PIL import Image
+        from src.utils.image_processor import ImageProcessor, THUMBNAIL_SIZE
+        
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        url = "https://example.com/a.png"
+        
+        first = processor._clip_array(url, Image.new("RGB", (400, 300), (10, 20, 30)))
+        second = processor._clip_array(url, Image.new("RGB", (400, 300), "white"))
+        
+        assert first.shape == (THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0], 3)
+        assert second.tolist() == first.tolist()
+    
+    def test_analysis_is_cached_by_content(self, tmp_path, monkeypatch):
+        """Test that identical pixels are analyzed once per analysis version."""
+        from PIL import Image
+        from src.utils import image_processor
+        from src.utils.image_processor import ImageProcessor
+        
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        calls = []
+        monkeypatch.setattr(processor, "_analyze", lambda image: calls.append(image) or {"width": image.width})
+        
+        results = processor.analyze_batch([Image.new("RGB", (20, 10), "red")] * 2)
+        again = processor.analyze_image(Image.new("RGB", (20, 10), "red"))
+        
+        assert len(calls) == 1
+        assert results[0]["width"] == results[1]["width"] == again["width"] == 20
+        
+        monkeypatch.setattr(image_processor, "ANALYSIS_VERSION", image_processor.ANALYSIS_VERSION + 1)
+        processor.analyze_image(Image.new("RGB", (20, 10), "red"))
+        
+        assert len(calls) == 2
+    
+    def test_photo_gets_lab_mean_color(self, tmp_path):
+        """Test that photos get a single perceptual mean color."""
+        from PIL import Image
+        from src.utils.image_processor import ImageProcessor
+        
+        processor = ImageProcessor(cache_dir=str(tmp_path))
+        analysis = processor.analyze_image(Image.new("RGB", (64, 48), "#336699"))
+        
+        assert analysis["image_type"] == "photo"
+        assert analysis["dominant_colors"] == ["#336699"]
+
+
 class TestAPI:
     """Tests for FastAPI endpoints."""
     